@@ -2,11 +2,15 @@
 # CONFIGURATION
 # ============================================================================
 
+import os
+
 MAGIC_BYTE_1 = 0xAD
 MAGIC_BYTE_2 = 0xDA
+MAGIC_BYTE_DELTA = 0xDB  # Second byte of a sparse (changed LEDs only) USB frame
 
 # Default settings
 DEFAULT_LED_COUNT = 60
+MAX_LED_COUNT = 300  # Matches MAX_LEDS in the firmware
 DEFAULT_BAUD_RATE = 115200
 DEFAULT_WEBSOCKET_PORT = 81
 DEFAULT_IP = "192.168.4.1"
@@ -14,6 +18,12 @@ DEFAULT_IP = "192.168.4.1"
 # Effect settings
 EFFECT_FPS = 30
 
+# Identical frames are not retransmitted, except as a periodic refresh
+FRAME_RESEND_INTERVAL = 1.0  # seconds
+
+# Per-frame debug output from the capture loop
+DEBUG_LOG = os.environ.get("AMBILIGHT_DEBUG") == "1"
+
 # Presets file path
 PRESETS_FILE = "color_presets.json"
 
@@ -1,6 +1,8 @@
 import json
+import os
 import time
 import threading
+import numpy as np
 import config
 
 try:
@@ -12,6 +14,14 @@ except ImportError:
     SERIAL_AVAILABLE = False
     print("Warning: pyserial not installed. USB mode disabled.")
 
+# Optional import for faster JSON (falls back to the stdlib json module)
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 try:
     import websocket
 
@@ -21,6 +31,47 @@ except ImportError:
     print("Warning: websocket-client not installed. WebSocket mode disabled.")
 
 
+def encode_command(cmd: dict) -> bytes:
+    """Serialize a command to UTF-8 JSON bytes."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(cmd)
+    return json.dumps(cmd).encode()
+
+
+def decode_message(message):
+    """Parse a JSON message (str or bytes) from the device."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(message)
+    return json.loads(message)
+
+
+# Brightness has only 256 values and is sent while sliders move
+BRIGHTNESS_COMMANDS = tuple(
+    encode_command({"cmd": "brightness", "value": value}) for value in range(256)
+)
+
+
+# One changed LED in a delta frame: little-endian index, then R, G, B
+DELTA_ENTRY = np.dtype([("index", "<u2"), ("rgb", "u1", (3,))])
+
+
+def xor_checksum(data) -> int:
+    """XOR of all bytes, folded from 64-bit words (8 bytes per XOR)."""
+    buf = np.frombuffer(data, dtype=np.uint8)
+    pad = (-len(buf)) % 8
+    if pad:
+        buf = np.concatenate([buf, np.zeros(pad, dtype=np.uint8)])
+    if len(buf) == 0:
+        return 0
+
+    folded = int(np.bitwise_xor.reduce(buf.view(np.uint64)))
+    checksum = 0
+    for _ in range(8):
+        checksum ^= folded & 0xFF
+        folded >>= 8
+    return checksum
+
+
 class ConnectionManager:
     """Manages connections to ESP32 via USB or WebSocket."""
 
@@ -33,6 +84,27 @@ class ConnectionManager:
         self.ws = None
         self.ws_thread = None
 
+        # Bound send methods cached at connect time for the hot path
+        self._write = None
+        self._ws_send = None
+        self._serial_fd = None  # Raw fd for frame writes (POSIX only)
+
+        # Reusable USB frame: magic bytes + RGB payload + checksum
+        self._frame_buf = bytearray()
+        self._frame_lock = threading.Lock()  # UI and worker threads both send
+
+        # Last transmitted frame, used to skip identical retransmits
+        self._last_frame = None
+        self._last_frame_time = 0.0
+        self._last_full_frame_time = 0.0  # Delta frames build on a full one
+
+        # Set when the firmware reports it understands sparse USB frames
+        self.supports_delta = False
+        # Set when the firmware accepts the base64 save_map_packed command
+        self.supports_packed_map = False
+        # Set when save_map_packed can also end calibration via "end"
+        self.supports_map_end = False
+
         # Callbacks
         self.on_connected = None
         self.on_disconnected = None
@@ -49,27 +121,36 @@ class ConnectionManager:
             return False
 
         try:
-            self.serial_port = serial.Serial(port, baud, timeout=1)
+            # Bounded writes so a stalled device can't hang the capture thread
+            self.serial_port = serial.Serial(port, baud, timeout=1, write_timeout=1)
+            try:
+                # Linux only: skip the USB-serial latency timer on replies
+                self.serial_port.set_low_latency_mode(True)
+            except (AttributeError, NotImplementedError, OSError, ValueError):
+                pass  # Not supported by this platform or driver
             time.sleep(2)  # Wait for Arduino reset
             self.serial_port.reset_input_buffer()
 
             # Mark as connected first so send_command works
+            self._write = self.serial_port.write
+            with self._frame_lock:
+                self._last_frame = None
+            self.supports_delta = False
+            self.supports_packed_map = False
+            self.supports_map_end = False
+            try:
+                self._serial_fd = self.serial_port.fileno()
+            except Exception:
+                self._serial_fd = None  # Not available on Windows
             self.mode = "usb"
             self.connected = True
 
             # Request device info with retry
             for attempt in range(3):
                 print(f"[USB] Requesting device info (attempt {attempt + 1}/3)...")
-                self.serial_port.write((json.dumps({"cmd": "info"}) + "\n").encode())
-                time.sleep(0.5)
-
-                # Try to read response
-                if self.serial_port.in_waiting:
-                    response = self.serial_port.readline().decode().strip()
-                    print(f"[USB] Response: {response}")
-                    if response.startswith("{"):
-                        self._handle_message(response)
-                        break
+                self.serial_port.write(encode_command({"cmd": "info"}) + b"\n")
+                if self._read_info_reply(timeout=1.0):
+                    break
 
             if self.on_connected:
                 self.on_connected("usb", port)
@@ -83,6 +164,39 @@ class ConnectionManager:
             self.mode = None
             return False
 
+    def _read_info_reply(self, timeout: float) -> bool:
+        """
+        Read lines until the device answers with info/ready or timeout expires.
+        Reads whatever is buffered per call rather than one byte at a time.
+        """
+        port = self.serial_port
+        deadline = time.monotonic() + timeout
+        buf = bytearray()
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                port.timeout = remaining
+                buf += port.read(max(1, port.in_waiting))
+
+                while b"\n" in buf:
+                    line, _, rest = bytes(buf).partition(b"\n")
+                    buf = bytearray(rest)
+                    response = line.decode(errors="replace").strip()
+                    if not response.startswith("{"):
+                        continue  # Boot noise or debug output
+                    print(f"[USB] Response: {response}")
+                    try:
+                        msg_type = decode_message(response).get("type", "")
+                    except (json.JSONDecodeError, AttributeError):
+                        continue
+                    if msg_type in ("info", "ready"):
+                        self._handle_message(response)
+                        return True
+        finally:
+            port.timeout = 1
+
     def connect_websocket(
         self, ip: str, port: int = config.DEFAULT_WEBSOCKET_PORT
     ) -> bool:
@@ -127,6 +241,11 @@ class ConnectionManager:
     def disconnect(self):
         """Disconnect from current connection."""
         self.connected = False
+        with self._frame_lock:
+            self._last_frame = None
+        self.supports_delta = False
+        self.supports_packed_map = False
+        self.supports_map_end = False
 
         if self.mode == "usb" and self.serial_port:
             try:
@@ -134,6 +253,8 @@ class ConnectionManager:
             except Exception:
                 pass
             self.serial_port = None
+            self._write = None
+            self._serial_fd = None
 
         elif self.mode == "websocket" and self.ws:
             try:
@@ -141,6 +262,7 @@ class ConnectionManager:
             except Exception:
                 pass
             self.ws = None
+            self._ws_send = None
 
         self.mode = None
 
@@ -151,15 +273,26 @@ class ConnectionManager:
         """Send JSON command to device."""
         if not self.connected:
             return False
+        return self._send_encoded(encode_command(cmd))
+
+    def send_brightness(self, value: int) -> bool:
+        """Send a brightness command (0-255) using its pre-encoded bytes."""
+        if not self.connected:
+            return False
+        return self._send_encoded(BRIGHTNESS_COMMANDS[max(0, min(255, value))])
 
+    def _send_encoded(self, data: bytes) -> bool:
+        """Send an already encoded JSON command."""
         try:
-            data = json.dumps(cmd)
+            with self._frame_lock:
+                # Commands can change what the strip shows (clear, calibration...)
+                self._last_frame = None
 
-            if self.mode == "usb":
-                self.serial_port.write((data + "\n").encode())
+                if self.mode == "usb":
+                    self._write(data + b"\n")
 
-            elif self.mode == "websocket":
-                self.ws.send(data)
+                elif self.mode == "websocket":
+                    self._ws_send(data)
 
             return True
 
@@ -167,39 +300,103 @@ class ConnectionManager:
             print(f"Send command error: {e}")
             return False
 
-    def send_colors(self, rgb_data: bytes) -> bool:
-        """Send LED color data to device."""
+    def send_colors(self, rgb_data) -> bool:
+        """Send LED color data (any bytes-like object) to device."""
         if not self.connected:
             return False
 
-        try:
-            if self.mode == "websocket":
-                # WebSocket uses raw binary (has its own integrity check)
-                self.ws.send(rgb_data, opcode=websocket.ABNF.OPCODE_BINARY)
-
-            else:
-                # USB uses framed protocol with checksum
-                checksum = 0
-                for b in rgb_data:
-                    checksum ^= b
-
-                frame = (
-                    bytes([config.MAGIC_BYTE_1, config.MAGIC_BYTE_2])
-                    + rgb_data
-                    + bytes([checksum])
-                )
+        # Immutable snapshot: kept as _last_frame, and == compares bytes even
+        # for numpy arrays (no copy when rgb_data is already bytes)
+        rgb_data = bytes(rgb_data)
 
-                if self.mode == "usb":
-                    self.serial_port.write(frame)
+        # Held for the whole send so command resets of _last_frame can't
+        # interleave with recording this frame
+        with self._frame_lock:
+            now = time.monotonic()
+            if (
+                rgb_data == self._last_frame
+                and now - self._last_frame_time < config.FRAME_RESEND_INTERVAL
+            ):
+                return True
 
-            return True
+            try:
+                if self.mode == "websocket":
+                    # WebSocket uses raw binary (has its own integrity check)
+                    self._ws_send(rgb_data, opcode=websocket.ABNF.OPCODE_BINARY)
+
+                else:
+                    # USB uses framed protocol with checksum
+                    frame = None
+                    if (
+                        self.supports_delta
+                        and self._last_frame is not None
+                        and len(self._last_frame) == len(rgb_data)
+                        and now - self._last_full_frame_time
+                        < config.FRAME_RESEND_INTERVAL
+                    ):
+                        frame = self._delta_frame(rgb_data)
+
+                    if frame is None:
+                        frame = self._frame_buf
+                        if len(frame) != len(rgb_data) + 3:
+                            frame = self._frame_buf = bytearray(len(rgb_data) + 3)
+                            frame[0] = config.MAGIC_BYTE_1
+                            frame[1] = config.MAGIC_BYTE_2
+                        frame[2:-1] = rgb_data
+                        frame[-1] = xor_checksum(rgb_data)
+                        self._last_full_frame_time = now
+
+                    if self.mode == "usb":
+                        self._write_frame(frame)
+
+                self._last_frame = rgb_data
+                self._last_frame_time = now
+                return True
+
+            except Exception as e:
+                print(f"Send colors error: {e}")
+                return False
 
-        except Exception as e:
-            print(f"Send colors error: {e}")
-            return False
+    def _delta_frame(self, rgb_data):
+        """
+        Sparse USB frame holding only the LEDs that changed since the last
+        frame, or None when a full frame would be as small:
+        0xAD 0xDB, count (uint16 LE), count x (index uint16 LE, r, g, b), XOR.
+        """
+        current = np.frombuffer(rgb_data, dtype=np.uint8).reshape(-1, 3)
+        previous = np.frombuffer(self._last_frame, dtype=np.uint8).reshape(-1, 3)
+        changed = np.flatnonzero((current != previous).any(axis=1))
+        if 5 * len(changed) + 2 >= 3 * len(current):
+            return None
+
+        entries = np.empty(len(changed), dtype=DELTA_ENTRY)
+        entries["index"] = changed
+        entries["rgb"] = current[changed]
+        body = len(changed).to_bytes(2, "little") + entries.tobytes()
+        return (
+            bytes((config.MAGIC_BYTE_1, config.MAGIC_BYTE_DELTA))
+            + body
+            + bytes((xor_checksum(body),))
+        )
+
+    def _write_frame(self, frame):
+        """Write a frame straight to the serial fd, falling back to pyserial."""
+        if self._serial_fd is not None:
+            try:
+                written = os.write(self._serial_fd, frame)
+            except OSError:
+                written = 0
+            if written == len(frame):
+                return
+            # Partial or failed raw write - let pyserial finish the rest
+            frame = frame[written:]
+        self._write(frame)
 
     # WebSocket callbacks
     def _ws_on_open(self, ws):
+        self._ws_send = ws.send
+        with self._frame_lock:
+            self._last_frame = None
         self.mode = "websocket"
         self.connected = True
         print("[WS] Connection opened, waiting for device info...")
@@ -219,18 +416,21 @@ class ConnectionManager:
 
     def _handle_message(self, message):
         try:
-            data = json.loads(message)
+            data = decode_message(message)
             msg_type = data.get("type", "")
 
             if msg_type in ["info", "ready"]:
                 self.led_count = data.get("ledCount", 60)
+                self.supports_delta = bool(data.get("deltaFrames", False))
+                self.supports_packed_map = bool(data.get("packedMap", False))
+                self.supports_map_end = bool(data.get("mapEnd", False))
                 print(f"[WS] Device info received: {self.led_count} LEDs")
 
             if self.on_message:
                 self.on_message(data)
 
         except json.JSONDecodeError:
-            pass
+            pass  # orjson.JSONDecodeError subclasses this; garbled lines only
 
     def _error(self, msg):
         print(f"Connection error: {msg}")
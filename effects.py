@@ -1,10 +1,9 @@
 """
 Gradient effect generators for LED animations.
-Each function returns a bytearray of RGB values for all LEDs.
+Each function returns the RGB bytes for all LEDs.
 """
 
-import math
-import random
+import numpy as np
 
 
 def hsv_to_rgb(h, s, v):
@@ -36,10 +35,83 @@ def hsv_to_rgb(h, s, v):
     return int(r * 255), int(g * 255), int(b * 255)
 
 
+def hsv_to_rgb_array(h, s, v):
+    """
+    Vectorized hsv_to_rgb() for arrays of hue/saturation/value (0-1 range).
+    Returns an (N, 3) uint8 array with the same truncation as the scalar version.
+    """
+    h, s, v = np.broadcast_arrays(
+        np.asarray(h, dtype=np.float64),
+        np.asarray(s, dtype=np.float64),
+        np.asarray(v, dtype=np.float64),
+    )
+    h6 = h * 6
+    i = h6.astype(np.int64)
+    f = h6 - i
+    p = v * (1 - s)
+    q = v * (1 - s * f)
+    t = v * (1 - s * (1 - f))
+
+    # Same sector table as hsv_to_rgb(); s == 0 falls out as p == q == t == v
+    i %= 6
+    rgb = np.empty(h.shape + (3,), dtype=np.uint8)
+    rgb[..., 0] = np.choose(i, [v, q, p, p, t, v]) * 255
+    rgb[..., 1] = np.choose(i, [t, v, v, q, p, p]) * 255
+    rgb[..., 2] = np.choose(i, [p, p, t, v, v, q]) * 255
+    return rgb
+
+
 def apply_brightness(r, g, b, brightness):
     """Apply brightness (0-255) to RGB values."""
-    factor = brightness / 255.0
-    return int(r * factor), int(g * factor), int(b * factor)
+    scale = brightness + 1
+    return (r * scale) >> 8, (g * scale) >> 8, (b * scale) >> 8
+
+
+def scale_brightness(colors, brightness):
+    """
+    Apply brightness (0-255) to a whole frame of full-range RGB values.
+    Uses (x * (brightness + 1)) >> 8 so 255 stays 255 and 0 goes to black.
+    """
+    # Local scratch only: frames may be generated on several threads at
+    # once, so no buffer is shared between calls
+    scaled = np.asarray(colors, dtype=np.uint8).reshape(-1).astype(np.uint16)
+    scaled *= brightness + 1
+    scaled >>= 8
+    return scaled.astype(np.uint8).tobytes()
+
+
+_IDX_CACHE = {}
+
+# Sine lookup table - LED gradients don't need full libm precision
+_SIN_LUT_SIZE = 4096
+_SIN_LUT = np.sin(
+    np.linspace(0, 2 * np.pi, _SIN_LUT_SIZE, endpoint=False)
+).astype(np.float32)
+_SIN_LUT_SCALE = _SIN_LUT_SIZE / (2 * np.pi)
+
+
+def _sin(x):
+    """Table-based sine for non-negative arrays (about 0.0015 rad resolution)."""
+    return _SIN_LUT[(x * _SIN_LUT_SCALE).astype(np.int64) & (_SIN_LUT_SIZE - 1)]
+
+
+def _led_index(num_leds):
+    """Per-LED constants that depend only on the strip length (cached)."""
+    idx = _IDX_CACHE.get(num_leds)
+    if idx is None:
+        i = np.arange(num_leds, dtype=np.float64)
+        pos = i / num_leds
+        idx = {
+            "pos": pos,
+            "pos05": pos * 0.5,
+            "pos8": pos * 8,
+            "pos15": pos * 15,
+            "i01": i * 0.1,
+            "i03": i * 0.3,
+            "i05": i * 0.5,
+        }
+        _IDX_CACHE[num_leds] = idx
+    return idx
 
 
 def generate_rainbow(num_leds, brightness, phase):
@@ -47,16 +119,10 @@ def generate_rainbow(num_leds, brightness, phase):
     Generate smooth rainbow gradient that moves across LEDs.
     Phase: 0.0 to 1.0 controls animation position.
     """
-    led_colors = bytearray()
+    # Each LED gets a different hue, offset by phase
+    hues = (_led_index(num_leds)["pos"] + phase) % 1.0
 
-    for i in range(num_leds):
-        # Each LED gets a different hue, offset by phase
-        hue = (i / num_leds + phase) % 1.0
-        r, g, b = hsv_to_rgb(hue, 1.0, 1.0)
-        r, g, b = apply_brightness(r, g, b, brightness)
-        led_colors.extend([r, g, b])
-
-    return led_colors
+    return scale_brightness(hsv_to_rgb_array(hues, 1.0, 1.0), brightness)
 
 
 def generate_fire(num_leds, brightness, phase):
@@ -64,35 +130,27 @@ def generate_fire(num_leds, brightness, phase):
     Generate fire/flame effect with warm colors and flickering.
     Phase controls the random seed for consistent animation.
     """
-    led_colors = bytearray()
-
-    # Use phase to create smooth variation
-    random.seed(int(phase * 1000) % 1000)
+    # Use phase to create smooth variation (local RNG, global state untouched)
+    rng = np.random.default_rng(int(phase * 1000) % 1000)
 
-    for i in range(num_leds):
-        # Base flame color (red-orange-yellow)
-        base_heat = 0.6 + 0.4 * math.sin(phase * 10 + i * 0.5)
-        flicker = random.uniform(0.7, 1.0)
-        heat = base_heat * flicker
+    # Base flame color (red-orange-yellow)
+    base_heats = 0.6 + 0.4 * np.sin(phase * 10 + _led_index(num_leds)["i05"])
+    heat = base_heats * rng.uniform(0.7, 1.0, num_leds)
 
-        # Map heat to color (black -> red -> orange -> yellow -> white)
-        if heat < 0.33:
-            r = int(heat * 3 * 255)
-            g = 0
-            b = 0
-        elif heat < 0.66:
-            r = 255
-            g = int((heat - 0.33) * 3 * 200)
-            b = 0
-        else:
-            r = 255
-            g = 200 + int((heat - 0.66) * 3 * 55)
-            b = int((heat - 0.66) * 3 * 100)
+    # Map heat to color (black -> red -> orange -> yellow -> white)
+    low = heat < 0.33
+    mid = ~low & (heat < 0.66)
+    high = heat >= 0.66
 
-        r, g, b = apply_brightness(r, g, b, brightness)
-        led_colors.extend([r, g, b])
+    led_colors = np.zeros((num_leds, 3), dtype=np.uint8)
+    led_colors[:, 0] = np.where(low, heat * 3 * 255, 255)
+    led_colors[mid, 1] = (heat[mid] - 0.33) * 3 * 200
+    led_colors[high, 1] = np.minimum(
+        200 + ((heat[high] - 0.66) * 3 * 55).astype(np.int64), 255
+    )
+    led_colors[high, 2] = (heat[high] - 0.66) * 3 * 100
 
-    return led_colors
+    return scale_brightness(led_colors, brightness)
 
 
 def generate_ocean(num_leds, brightness, phase):
@@ -100,25 +158,22 @@ def generate_ocean(num_leds, brightness, phase):
     Generate ocean wave effect with blues and teals.
     Phase controls wave position.
     """
-    led_colors = bytearray()
+    idx = _led_index(num_leds)
 
-    for i in range(num_leds):
-        # Multiple overlapping waves
-        wave1 = math.sin(phase * 4 + i * 0.3) * 0.5 + 0.5
-        wave2 = math.sin(phase * 6 + i * 0.5 + 2) * 0.3 + 0.5
-        wave3 = math.sin(phase * 2 + i * 0.1) * 0.2 + 0.5
+    # Multiple overlapping waves
+    wave1 = _sin(phase * 4 + idx["i03"]) * 0.5 + 0.5
+    wave2 = _sin(phase * 6 + idx["i05"] + 2) * 0.3 + 0.5
+    wave3 = _sin(phase * 2 + idx["i01"]) * 0.2 + 0.5
 
-        combined = (wave1 + wave2 + wave3) / 3
+    combined = (wave1 + wave2 + wave3) / 3
 
-        # Ocean colors: deep blue to teal to light blue
-        r = int(combined * 50)
-        g = int(100 + combined * 100)
-        b = int(150 + combined * 105)
+    # Ocean colors: deep blue to teal to light blue
+    led_colors = np.empty((num_leds, 3), dtype=np.uint8)
+    led_colors[:, 0] = combined * 50
+    led_colors[:, 1] = 100 + combined * 100
+    led_colors[:, 2] = 150 + combined * 105
 
-        r, g, b = apply_brightness(r, g, b, brightness)
-        led_colors.extend([r, g, b])
-
-    return led_colors
+    return scale_brightness(led_colors, brightness)
 
 
 def generate_aurora(num_leds, brightness, phase):
@@ -126,29 +181,23 @@ def generate_aurora(num_leds, brightness, phase):
     Generate aurora borealis effect with greens, blues, and purples.
     Phase controls the flowing animation.
     """
-    led_colors = bytearray()
+    idx = _led_index(num_leds)
 
-    for i in range(num_leds):
-        # Slow flowing waves with color transitions
-        pos = i / num_leds
-        wave = math.sin(phase * 2 + pos * 8) * 0.5 + 0.5
-        shimmer = math.sin(phase * 5 + pos * 15) * 0.3 + 0.7
+    # Slow flowing waves with color transitions
+    wave = _sin(phase * 2 + idx["pos8"]) * 0.5 + 0.5
+    shimmer = _sin(phase * 5 + idx["pos15"]) * 0.3 + 0.7
 
-        # Cycle through aurora colors (green -> teal -> blue -> purple -> green)
-        hue_base = (phase * 0.5 + pos * 0.5) % 1.0
+    # Cycle through aurora colors (green -> teal -> blue -> purple -> green)
+    hue_base = (phase * 0.5 + idx["pos05"]) % 1.0
 
-        # Aurora hue range: green (0.33) to purple (0.8)
-        hue = 0.33 + hue_base * 0.47
+    # Aurora hue range: green (0.33) to purple (0.8)
+    hues = 0.33 + hue_base * 0.47
 
-        # Vary saturation and value based on waves
-        sat = 0.7 + wave * 0.3
-        val = 0.5 + shimmer * 0.5
+    # Vary saturation and value based on waves
+    sats = 0.7 + wave * 0.3
+    vals = 0.5 + shimmer * 0.5
 
-        r, g, b = hsv_to_rgb(hue, sat, val)
-        r, g, b = apply_brightness(r, g, b, brightness)
-        led_colors.extend([r, g, b])
-
-    return led_colors
+    return scale_brightness(hsv_to_rgb_array(hues, sats, vals), brightness)
 
 
 def generate_static_color(num_leds, brightness, r, g, b):
@@ -156,10 +205,7 @@ def generate_static_color(num_leds, brightness, r, g, b):
     Generate solid color for all LEDs.
     """
     r, g, b = apply_brightness(r, g, b, brightness)
-    led_colors = bytearray()
-    for _ in range(num_leds):
-        led_colors.extend([r, g, b])
-    return led_colors
+    return bytes((r, g, b)) * num_leds
 
 
 # Effect registry for easy lookup
@@ -169,3 +215,8 @@ EFFECTS = {
     "Ocean Wave": generate_ocean,
     "Aurora": generate_aurora,
 }
+
+
+def get_effect(name):
+    """Look up an effect generator once so render loops can cache it."""
+    return EFFECTS.get(name, generate_rainbow)
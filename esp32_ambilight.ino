@@ -17,6 +17,14 @@
  * - Bytes 2-N: LED_COUNT * 3 bytes (R,G,B for each LED)
  * - Last Byte: checksum (XOR of all RGB bytes)
  * 
+ * USB Protocol (Delta Frame - only LEDs changed since the last frame):
+ * - Byte 0: 0xAD (magic start byte)
+ * - Byte 1: 0xDB (delta sync byte)
+ * - Bytes 2-3: number of entries (uint16, little-endian)
+ * - Then per entry: LED index (uint16, little-endian), R, G, B
+ * - Last Byte: checksum (XOR of the count and entry bytes)
+ * - Applied on top of the last full frame; ignored until one has arrived
+ * 
  * WebSocket: Same as existing main.ino (JSON commands + binary RGB data)
  */
 
@@ -26,6 +34,7 @@
 #include <FastLED.h>
 #include <Preferences.h>
 #include <ArduinoJson.h>
+#include <mbedtls/base64.h>
 
 // ============================================================================
 // CONFIGURATION CONSTANTS
@@ -39,6 +48,7 @@
 // Protocol constants
 #define MAGIC_BYTE_1    0xAD        // Start of binary frame
 #define MAGIC_BYTE_2    0xDA        // Sync confirmation
+#define MAGIC_BYTE_DELTA 0xDB       // Sync byte of a delta frame
 #define SERIAL_BAUD     115200
 
 // AP Configuration
@@ -84,8 +94,12 @@ LEDMapping ledMap[MAX_LEDS];
 
 // Serial protocol state machine
 int serialSyncState = 0;            // 0=idle, 1=got 0xAD, 2=got 0xDA, 3=reading RGB
+                                    // 4-6=delta frame: count, entries, checksum
 int serialBufferIndex = 0;
 uint8_t serialRgbBuffer[MAX_LEDS * 3];
+uint8_t usbFrame[MAX_LEDS * 3];     // Last full USB frame, base for delta frames
+bool usbFrameValid = false;
+int deltaCount = 0;
 unsigned long lastSerialByte = 0;
 const unsigned long SERIAL_TIMEOUT_MS = 50;
 
@@ -123,6 +137,7 @@ void handleSerialData();
 void webSocketEvent(uint8_t num, WStype_t type, uint8_t* payload, size_t length);
 void applyLedColors(uint8_t* rgbData, int dataLen, const char* source);
 void testPattern();
+void endCalibration(const char* source, int wsNum);
 void startupAnimation();
 String getConfigPageHtml();
 
@@ -289,8 +304,8 @@ void handleSerialData() {
                 serialJsonBuffer = "";
                 serialJsonMode = false;
             }
-            // Safety: limit JSON buffer size
-            if (serialJsonBuffer.length() > 512) {
+            // Safety: limit JSON buffer size (packed maps for MAX_LEDS fit)
+            if (serialJsonBuffer.length() > 1024) {
                 serialJsonBuffer = "";
                 serialJsonMode = false;
             }
@@ -312,6 +327,9 @@ void handleSerialData() {
                 if (b == MAGIC_BYTE_2) {
                     serialSyncState = 2;
                     serialBufferIndex = 0;
+                } else if (b == MAGIC_BYTE_DELTA) {
+                    serialSyncState = 4;
+                    serialBufferIndex = 0;
                 } else {
                     serialSyncState = 0;  // False start, reset
                 }
@@ -339,6 +357,9 @@ void handleSerialData() {
                     }
                     
                     if (checksum == b) {
+                        // Keep a copy for delta frames to build on
+                        memcpy(usbFrame, serialRgbBuffer, numLeds * 3);
+                        usbFrameValid = true;
                         applyLedColors(serialRgbBuffer, numLeds * 3, "USB");
                     }
                     // else: checksum mismatch, discard frame
@@ -347,6 +368,49 @@ void handleSerialData() {
                     serialBufferIndex = 0;
                 }
                 break;
+                
+            case 4:  // Delta frame: reading the 2-byte entry count
+                serialRgbBuffer[serialBufferIndex++] = b;
+                if (serialBufferIndex == 2) {
+                    deltaCount = serialRgbBuffer[0] | (serialRgbBuffer[1] << 8);
+                    if (deltaCount * 5 > MAX_LEDS * 3 - 2) {
+                        serialSyncState = 0;  // Can't be valid, resync
+                    } else {
+                        serialSyncState = deltaCount > 0 ? 5 : 6;
+                    }
+                }
+                break;
+                
+            case 5:  // Delta frame: reading (index, R, G, B) entries after the count
+                serialRgbBuffer[serialBufferIndex++] = b;
+                if (serialBufferIndex >= 2 + deltaCount * 5) {
+                    serialSyncState = 6;
+                }
+                break;
+                
+            case 6:  // Delta frame: verify checksum, then patch the last full frame
+                {
+                    uint8_t checksum = 0;
+                    for (int i = 0; i < serialBufferIndex; i++) {
+                        checksum ^= serialRgbBuffer[i];
+                    }
+                    
+                    if (checksum == b && usbFrameValid) {
+                        for (int i = 0; i < deltaCount; i++) {
+                            uint8_t* entry = &serialRgbBuffer[2 + i * 5];
+                            int led = entry[0] | (entry[1] << 8);
+                            if (led < numLeds) {
+                                memcpy(&usbFrame[led * 3], &entry[2], 3);
+                            }
+                        }
+                        applyLedColors(usbFrame, numLeds * 3, "USB");
+                    }
+                    // else: bad checksum or no base frame yet, discard
+                    
+                    serialSyncState = 0;
+                    serialBufferIndex = 0;
+                }
+                break;
         }
     }
 }
@@ -373,6 +437,8 @@ void webSocketEvent(uint8_t num, WStype_t type, uint8_t* payload, size_t length)
                 doc["brightness"] = currentBrightness;
                 doc["usbEnabled"] = enableUsb;
                 doc["wsEnabled"] = enableWebSocket;
+                doc["packedMap"] = true;  // Understands save_map_packed
+                doc["mapEnd"] = true;     // save_map_packed honours "end"
                 
                 String response;
                 serializeJson(doc, response);
@@ -412,7 +478,7 @@ void webSocketEvent(uint8_t num, WStype_t type, uint8_t* payload, size_t length)
 // ============================================================================
 
 void processJsonCommand(String& cmdStr, const char* source, int wsNum) {
-    StaticJsonDocument<1024> doc;
+    StaticJsonDocument<1536> doc;
     DeserializationError error = deserializeJson(doc, cmdStr);
     
     if (error) {
@@ -428,6 +494,9 @@ void processJsonCommand(String& cmdStr, const char* source, int wsNum) {
         resp["type"] = "info";
         resp["ledCount"] = numLeds;
         resp["brightness"] = currentBrightness;
+        resp["deltaFrames"] = true;  // Understands 0xAD 0xDB USB frames
+        resp["packedMap"] = true;    // Understands save_map_packed
+        resp["mapEnd"] = true;       // save_map_packed honours "end"
         
         String response;
         serializeJson(resp, response);
@@ -445,12 +514,7 @@ void processJsonCommand(String& cmdStr, const char* source, int wsNum) {
         Serial.printf("[%s] Calibration started\n", source);
     }
     else if (cmd == "calibrate_end") {
-        calibrationMode = false;
-        highlightLED = -1;
-        FastLED.clear();
-        FastLED.show();
-        sendAck(source, "calibrate_end", wsNum);
-        Serial.printf("[%s] Calibration ended\n", source);
+        endCalibration(source, wsNum);
     }
     else if (cmd == "highlight") {
         highlightLED = doc["led"] | -1;
@@ -467,6 +531,26 @@ void processJsonCommand(String& cmdStr, const char* source, int wsNum) {
             Serial.printf("[%s] LED mapping saved\n", source);
         }
     }
+    else if (cmd == "save_map_packed") {
+        // Base64 of x,y byte pairs per LED (no nested objects, fits a USB line)
+        const char* data = doc["data"] | "";
+        static uint8_t packed[MAX_LEDS * 2];
+        size_t len = 0;
+        if (mbedtls_base64_decode(packed, sizeof(packed), &len,
+                (const unsigned char*)data, strlen(data)) == 0) {
+            for (int i = 0; i < numLeds && i < (int)(len / 2); i++) {
+                ledMap[i].screenX = packed[i * 2];
+                ledMap[i].screenY = packed[i * 2 + 1];
+            }
+            saveLEDMapping();
+            sendAck(source, "save_map", wsNum);
+            Serial.printf("[%s] LED mapping saved (%u LEDs)\n", source, len / 2);
+        }
+        // Lets the client finish calibration in the same message
+        if (doc["end"] | false) {
+            endCalibration(source, wsNum);
+        }
+    }
     else if (cmd == "test_pattern") {
         testPattern();
         sendAck(source, "test_pattern", wsNum);
@@ -484,6 +568,15 @@ void processJsonCommand(String& cmdStr, const char* source, int wsNum) {
     }
 }
 
+void endCalibration(const char* source, int wsNum) {
+    calibrationMode = false;
+    highlightLED = -1;
+    FastLED.clear();
+    FastLED.show();
+    sendAck(source, "calibrate_end", wsNum);
+    Serial.printf("[%s] Calibration ended\n", source);
+}
+
 // Helper to send acknowledgment
 void sendAck(const char* source, const char* cmd, int wsNum) {
     StaticJsonDocument<128> doc;
@@ -724,6 +817,7 @@ void setupWebServer() {
             int newLeds = request->getParam("leds", true)->value().toInt();
             if (newLeds >= 1 && newLeds <= MAX_LEDS) {
                 numLeds = newLeds;
+                usbFrameValid = false;  // Delta frames need a new full frame
             }
         }
         if (request->hasParam("brightness", true)) {
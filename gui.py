@@ -3,15 +3,21 @@ from tkinter import messagebox, colorchooser
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
 import threading
+import queue
 import time
 import json
 import os
+import sys
+import base64
+import zlib
+from functools import lru_cache
 import numpy as np
-from PIL import ImageGrab, Image
+from PIL import Image, ImageDraw, ImageFont, ImageTk
 import config
 from connection_manager import ConnectionManager, SERIAL_AVAILABLE, WEBSOCKET_AVAILABLE
 import image_processor
 import effects
+import screen_capture
 from network_scanner import NetworkScanner
 
 # Optional import for system tray
@@ -30,6 +36,14 @@ try:
 except ImportError:
     pass
 
+# Optional import for faster JSON (falls back to the stdlib json module)
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 try:
     from screeninfo import get_monitors
 
@@ -39,9 +53,67 @@ except ImportError:
     print("Warning: screeninfo not installed. Multi-monitor selection disabled.")
 
 
+def _read_json(path):
+    """Load a JSON file, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def _write_json(path, data):
+    """Write data as indented JSON, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        return
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+
+
+def _sleep_until(deadline, period):
+    """
+    Sleep until deadline and return the next frame's deadline.
+    After an overrun the schedule restarts from now instead of bursting.
+    """
+    remaining = deadline - time.monotonic()
+    if remaining > 0:
+        time.sleep(remaining)
+        return deadline + period
+    return time.monotonic() + period
+
+
+def _raise_thread_priority():
+    """Best-effort bump of the calling thread's scheduling priority."""
+    try:
+        if sys.platform == "win32":
+            import ctypes
+
+            kernel32 = ctypes.windll.kernel32
+            THREAD_PRIORITY_ABOVE_NORMAL = 1
+            kernel32.SetThreadPriority(
+                kernel32.GetCurrentThread(), THREAD_PRIORITY_ABOVE_NORMAL
+            )
+        elif sys.platform.startswith("linux"):
+            # Linux nice values are per thread; going below 0 needs CAP_SYS_NICE
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), -5)
+    except (AttributeError, OSError):
+        pass  # Not permitted or not supported - run at normal priority
+
+
+@lru_cache(maxsize=256)
+def _rgb_to_hex_cached(rgb):
+    """Format an (r, g, b) tuple as a Tk hex color string."""
+    return f"#{rgb[0]:02x}{rgb[1]:02x}{rgb[2]:02x}"
+
+
 class AmbilightController:
     """Main application window."""
 
+    # Every string a percentage entry may hold ("" while editing)
+    _VALID_PERCENTS = frozenset([""] + [str(i) for i in range(101)])
+
     def __init__(self, root):
         self.root = root
         self.root.title("ESP32 Ambilight Controller")
@@ -58,14 +130,22 @@ class AmbilightController:
         self.conn.on_disconnected = self._on_disconnected
         self.conn.on_message = self._on_message
         self.conn.on_error = self._on_error
+        self._connecting = False  # A connect attempt is running in the background
 
         # State
         self.num_leds = config.DEFAULT_LED_COUNT
         self.led_positions = []
+        self._canvas_items = {}  # Persistent LED map canvas item IDs
+        self._calibration_update_scheduled = False
+        self._backdrop_photo = None  # Keeps the LED map backdrop image alive
+        self._backdrop_size = None
         self.is_running = False
         self.calibration_mode = False
         self.current_led_index = 0
-        self.prev_colors = None
+        self.prev_colors = None  # float32 (num_leds, 3) smoothing state
+        self._prev_colors_valid = False
+        self._smooth_out = None  # uint8 output buffer for the smoothing blend
+        self._screen_map_lut = None  # (key, lut) cached for process_screen_map
 
         # Thread-safe parameter state
         self.current_brightness = 255
@@ -84,6 +164,17 @@ class AmbilightController:
         self.region_y = tk.StringVar(value="25")
         self.region_w = tk.StringVar(value="50")
         self.region_h = tk.StringVar(value="50")
+        self._capture_bbox = None  # Final capture region, recomputed on edits
+        self.skip_idle_frames = tk.BooleanVar(value=True)
+        self._mirror_var(self.skip_idle_frames, "_skip_idle_cached")
+        for var in (
+            self.use_custom_region,
+            self.region_x,
+            self.region_y,
+            self.region_w,
+            self.region_h,
+        ):
+            var.trace_add("write", self._recompute_capture_bbox)
 
         # Connection mode
         self.connection_mode = tk.StringVar(value="USB")
@@ -91,6 +182,7 @@ class AmbilightController:
         # Monitor selection
         self.selected_monitor = tk.StringVar(value="Primary")
         self.monitors = []  # List of detected monitors
+        self._monitor_bbox = None  # Cached bbox of the selected monitor
 
         # Output mode: "Screen Capture", "Static Color", "Effect"
         self.output_mode = tk.StringVar(value="Screen Capture")
@@ -98,6 +190,7 @@ class AmbilightController:
         # Static color settings
         self.static_color = (255, 147, 41)  # Default warm amber
         self.static_color_preview = None  # Canvas widget
+        self._static_frame = None  # (key, frame) of the last built static frame
 
         # Effect settings
         self.current_effect = tk.StringVar(value="Rainbow")
@@ -105,9 +198,17 @@ class AmbilightController:
         self.effect_phase = 0.0
         self.effect_running = False
 
+        # Plain-Python mirrors of Tk variables read by the worker loops
+        self._mirror_var(self.capture_mode, "_capture_mode_cached")
+        self._mirror_var(self.output_mode, "_output_mode_cached")
+        self._mirror_var(self.current_effect, "_current_effect_cached")
+        self._mirror_var(self.effect_speed, "_effect_speed_cached")
+
         # Presets
         self.presets = {}
         self.selected_preset = tk.StringVar(value="")
+        self._presets_dirty = False
+        self._presets_flush_scheduled = False
         self._load_presets()
 
         # System tray
@@ -117,6 +218,9 @@ class AmbilightController:
         self.create_ui()
         self.refresh_ports()
 
+        # Route window close through _on_close so pending state is flushed
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+
         # Setup system tray if available
         if TRAY_AVAILABLE:
             self._setup_tray()
@@ -142,10 +246,14 @@ class AmbilightController:
         )
 
         # Configure scroll region when frame size changes
+        self._scrollregion_pending = False
+        self._last_scrollregion = None
         self.main_frame.bind("<Configure>", self._on_frame_configure)
         self.scroll_canvas.bind("<Configure>", self._on_canvas_configure)
 
-        # Enable mousewheel scrolling
+        # Enable mousewheel scrolling (ticks are coalesced per idle pass)
+        self._scroll_accum = 0.0
+        self._scroll_pending = False
         self.scroll_canvas.bind_all("<MouseWheel>", self._on_mousewheel)
 
         # ===== Connection Frame =====
@@ -348,9 +456,14 @@ class AmbilightController:
             bootstyle="warning",
         )
         self.brightness_meter.pack()
-        # Track changes using after loop
+        # React to meter writes instead of polling
         self._last_brightness = 100
-        self._setup_brightness_polling()
+        self._brightness_after_id = None
+        self._pending_brightness = None
+        self._brightness_send_scheduled = False
+        self.brightness_meter.amountusedvar.trace_add(
+            "write", self._on_brightness_var_write
+        )
 
         # Smoothing Meter
         s_container = ttk.Frame(meter_frame)
@@ -368,9 +481,11 @@ class AmbilightController:
             bootstyle="primary",
         )
         self.smooth_meter.pack()
-        # Track changes using after loop
+        # React to meter writes instead of polling
         self._last_smoothing = 0
-        self._setup_smoothing_polling()
+        self.smooth_meter.amountusedvar.trace_add(
+            "write", self._on_smoothing_var_write
+        )
 
         # FPS Selection (Moved below meters)
         fps_frame = ttk.Frame(ctrl_frame)
@@ -378,6 +493,7 @@ class AmbilightController:
 
         ttk.Label(fps_frame, text="Target FPS:").pack(side="left", padx=5)
         self.fps_var = tk.StringVar(value="60")
+        self._mirror_var(self.fps_var, "_fps_cached", int)
         fps_combo = ttk.Combobox(
             fps_frame,
             textvariable=self.fps_var,
@@ -500,16 +616,7 @@ class AmbilightController:
         mode_combo = ttk.Combobox(
             cap_frame,
             textvariable=self.capture_mode,
-            values=[
-                "Screen Map",
-                "Average Color",
-                "Dominant Color",
-                "Edge Sampling",
-                "Quadrant Colors",
-                "Most Vibrant",
-                "Warm Bias",
-                "Cool Bias",
-            ],
+            values=["Screen Map", *image_processor.PROCESSORS],
             state="readonly",
             width=18,
         )
@@ -580,10 +687,18 @@ class AmbilightController:
         self.monitor_combo.grid(
             row=1, column=1, columnspan=2, padx=5, pady=5, sticky="w"
         )
+        self.monitor_combo.bind("<<ComboboxSelected>>", self._update_monitor_bbox)
         ttk.Button(cap_frame, text="🔄", width=3, command=self.refresh_monitors).grid(
             row=1, column=3, padx=5, pady=5, sticky="w"
         )
 
+        # Skip re-processing while the screen content is static
+        tk.Checkbutton(
+            cap_frame,
+            text="Skip Idle Frames",
+            variable=self.skip_idle_frames,
+        ).grid(row=1, column=4, padx=15, pady=5, sticky="w")
+
         # Initialize monitor list
         self.refresh_monitors()
 
@@ -593,11 +708,30 @@ class AmbilightController:
         )
         self.status_bar.pack(side=tk.BOTTOM, fill=tk.X)
 
+    def _mirror_var(self, var, attr, convert=None):
+        """Keep attr in sync with a Tk variable so loops avoid Tcl round-trips."""
+        if convert is None:
+            read = var.get
+        else:
+            read = lambda: convert(var.get())
+        setattr(self, attr, read())
+        var.trace_add("write", lambda *args: setattr(self, attr, read()))
+
     # ===== Scroll Helper Methods =====
 
     def _on_frame_configure(self, event):
         """Update scroll region when frame size changes."""
-        self.scroll_canvas.configure(scrollregion=self.scroll_canvas.bbox("all"))
+        if not self._scrollregion_pending:
+            self._scrollregion_pending = True
+            self.root.after_idle(self._apply_scrollregion)
+
+    def _apply_scrollregion(self):
+        """Apply the scroll region once per burst of resize events."""
+        self._scrollregion_pending = False
+        bbox = self.scroll_canvas.bbox("all")
+        if bbox != self._last_scrollregion:
+            self._last_scrollregion = bbox
+            self.scroll_canvas.configure(scrollregion=bbox)
 
     def _on_canvas_configure(self, event):
         """Resize the inner frame to match canvas width."""
@@ -605,7 +739,19 @@ class AmbilightController:
 
     def _on_mousewheel(self, event):
         """Handle mousewheel scrolling."""
-        self.scroll_canvas.yview_scroll(int(-1 * (event.delta / 120)), "units")
+        self._scroll_accum += -1 * (event.delta / 120)
+        if not self._scroll_pending:
+            self._scroll_pending = True
+            self.root.after_idle(self._flush_scroll)
+
+    def _flush_scroll(self):
+        """Apply accumulated mousewheel ticks in a single scroll."""
+        self._scroll_pending = False
+        units = int(self._scroll_accum)
+        # Keep the fractional part so high-resolution wheels still add up
+        self._scroll_accum -= units
+        if units:
+            self.scroll_canvas.yview_scroll(units, "units")
 
     # ===== UI Helper Methods =====
 
@@ -633,9 +779,11 @@ class AmbilightController:
 
     def refresh_monitors(self):
         """Detect and list all connected monitors."""
+        self._screen_size = None  # Resolution may have changed too
         if not SCREENINFO_AVAILABLE:
             self.monitor_combo["values"] = ["Primary (default)"]
             self.selected_monitor.set("Primary (default)")
+            self._update_monitor_bbox()
             return
 
         try:
@@ -661,29 +809,80 @@ class AmbilightController:
             self.monitor_combo["values"] = ["Primary (default)"]
             self.selected_monitor.set("Primary (default)")
 
+        self._update_monitor_bbox()
+
+    def _update_monitor_bbox(self, event=None):
+        """Recompute the cached bbox after the monitor selection changes."""
+        self._monitor_bbox = None  # None will capture primary screen
+        if SCREENINFO_AVAILABLE and self.monitors:
+            try:
+                idx = self.monitor_combo.current()
+                if 0 <= idx < len(self.monitors):
+                    m = self.monitors[idx]
+                    self._monitor_bbox = (m.x, m.y, m.x + m.width, m.y + m.height)
+            except Exception:
+                pass
+
+        self._recompute_capture_bbox()
+
+    def _recompute_capture_bbox(self, *args):
+        """Convert monitor + custom region settings into the capture bbox."""
+        monitor_bbox = self._monitor_bbox
+
+        if monitor_bbox:
+            mx, my, mx2, my2 = monitor_bbox
+            mw, mh = mx2 - mx, my2 - my
+
+            if self.use_custom_region.get():
+                # Custom region WITHIN the selected monitor
+                try:
+                    rx = mx + int(int(self.region_x.get() or "0") / 100 * mw)
+                    ry = my + int(int(self.region_y.get() or "0") / 100 * mh)
+                    rw = int(int(self.region_w.get() or "100") / 100 * mw)
+                    rh = int(int(self.region_h.get() or "100") / 100 * mh)
+                    bbox = (rx, ry, rx + rw, ry + rh)
+                except Exception as e:
+                    print(f"Region calc error: {e}")
+                    bbox = monitor_bbox
+            else:
+                bbox = monitor_bbox
+        else:
+            # Fallback: primary monitor only
+            bbox = None
+            if self.use_custom_region.get():
+                try:
+                    if self._screen_size is None:
+                        # Ask Tk for the size instead of grabbing the screen
+                        self._screen_size = (
+                            self.root.winfo_screenwidth(),
+                            self.root.winfo_screenheight(),
+                        )
+                    sw, sh = self._screen_size
+
+                    rx = int(int(self.region_x.get() or "0") / 100 * sw)
+                    ry = int(int(self.region_y.get() or "0") / 100 * sh)
+                    rw = int(int(self.region_w.get() or "100") / 100 * sw)
+                    rh = int(int(self.region_h.get() or "100") / 100 * sh)
+
+                    rx = max(0, min(rx, sw - 1))
+                    ry = max(0, min(ry, sh - 1))
+                    rw = max(1, min(rw, sw - rx))
+                    rh = max(1, min(rh, sh - ry))
+
+                    bbox = (rx, ry, rx + rw, ry + rh)
+                except Exception as e:
+                    print(f"Region calc error: {e}")
+                    bbox = None
+
+        self._capture_bbox = bbox
+
     def get_selected_monitor_bbox(self):
         """Get the bounding box (x, y, x2, y2) of the selected monitor."""
-        if not SCREENINFO_AVAILABLE or not self.monitors:
-            return None  # Will capture primary screen
-
-        try:
-            idx = self.monitor_combo.current()
-            if 0 <= idx < len(self.monitors):
-                m = self.monitors[idx]
-                return (m.x, m.y, m.x + m.width, m.y + m.height)
-        except Exception:
-            pass
-        return None
+        return self._monitor_bbox
 
     def validate_percent(self, val):
         """Validate percentage input (0-100)."""
-        if val == "":
-            return True
-        try:
-            v = int(val)
-            return 0 <= v <= 100
-        except ValueError:
-            return False
+        return val in self._VALID_PERCENTS
 
     def toggle_region_inputs(self):
         """Enable/disable region inputs based on checkbox."""
@@ -692,47 +891,51 @@ class AmbilightController:
             if isinstance(widget, ttk.Entry):
                 widget.config(state=state)
 
-    def _setup_brightness_polling(self):
-        """Setup polling to detect brightness meter changes."""
-        self._poll_brightness()
+    def _on_brightness_var_write(self, *args):
+        """Brightness meter was written - coalesce rapid writes while dragging."""
+        if self._brightness_after_id is None:
+            self._brightness_after_id = self.root.after(20, self._flush_brightness)
 
-    def _poll_brightness(self):
-        """Poll brightness meter for changes."""
+    def _flush_brightness(self):
+        """Apply the latest brightness meter value."""
+        self._brightness_after_id = None
         try:
-            # Get current value from meter widget
             current = int(self.brightness_meter.amountusedvar.get())
-            if current != self._last_brightness:
-                self._last_brightness = current
-                self._on_brightness_changed(current)
-        except (AttributeError, ValueError, tk.TclError):
-            pass
-        # Continue polling
-        self.root.after(100, self._poll_brightness)
+        except (ValueError, tk.TclError):
+            return
+        if current != self._last_brightness:
+            self._last_brightness = current
+            self._on_brightness_changed(current)
 
     def _on_brightness_changed(self, percent):
         """Handle brightness change."""
         brightness = int((percent / 100) * 255)
         brightness = max(0, min(255, brightness))
         self.current_brightness = brightness
-        if self.conn.connected:
-            self.conn.send_command({"cmd": "brightness", "value": brightness})
-
-    def _setup_smoothing_polling(self):
-        """Setup polling to detect smoothing meter changes."""
-        self._poll_smoothing()
 
-    def _poll_smoothing(self):
-        """Poll smoothing meter for changes."""
+        # Coalesce outbound commands while dragging; only the latest is sent
+        self._pending_brightness = brightness
+        if not self._brightness_send_scheduled:
+            self._brightness_send_scheduled = True
+            self.root.after(33, self._send_pending_brightness)
+
+    def _send_pending_brightness(self):
+        """Send the most recent brightness value to the device."""
+        self._brightness_send_scheduled = False
+        brightness = self._pending_brightness
+        self._pending_brightness = None
+        if brightness is not None and self.conn.connected:
+            self.conn.send_brightness(brightness)
+
+    def _on_smoothing_var_write(self, *args):
+        """Smoothing meter was written."""
         try:
-            # Get current value from meter widget
             current = int(self.smooth_meter.amountusedvar.get())
-            if current != self._last_smoothing:
-                self._last_smoothing = current
-                self._on_smoothing_changed(current)
-        except (AttributeError, ValueError, tk.TclError):
-            pass
-        # Continue polling
-        self.root.after(100, self._poll_smoothing)
+        except (ValueError, tk.TclError):
+            return
+        if current != self._last_smoothing:
+            self._last_smoothing = current
+            self._on_smoothing_changed(current)
 
     def _on_smoothing_changed(self, percent):
         """Handle smoothing change."""
@@ -742,7 +945,7 @@ class AmbilightController:
         """Apply manual LED count override."""
         try:
             new_count = int(self.led_count_var.get())
-            if 1 <= new_count <= 300:
+            if 1 <= new_count <= config.MAX_LED_COUNT:
                 self.num_leds = new_count
                 self.initialize_led_positions()
                 self.led_count_label.config(
@@ -751,7 +954,9 @@ class AmbilightController:
                 print(f"[App] LED count manually set to {new_count}")
                 messagebox.showinfo("Success", f"LED count set to {new_count}")
             else:
-                messagebox.showerror("Error", "LED count must be 1-300")
+                messagebox.showerror(
+                    "Error", f"LED count must be 1-{config.MAX_LED_COUNT}"
+                )
         except ValueError:
             messagebox.showerror("Error", "Invalid LED count")
 
@@ -759,6 +964,9 @@ class AmbilightController:
 
     def connect_device(self):
         """Connect to device based on selected mode."""
+        if self._connecting:
+            return
+
         mode = self.connection_mode.get()
 
         if mode == "USB":
@@ -768,14 +976,11 @@ class AmbilightController:
                 return
 
             self.status_label.config(text="Connecting...", foreground="orange")
-            self.root.update()
+            self.root.update_idletasks()
 
-            if self.conn.connect_usb(port):
-                self.status_label.config(
-                    text=f"Connected (USB: {port})", foreground="green"
-                )
-            else:
-                self.status_label.config(text="Connection Failed", foreground="red")
+            self._connect_in_background(
+                self.conn.connect_usb, port, f"Connected (USB: {port})"
+            )
 
         elif mode == "WebSocket":
             ip = self.ip_var.get().strip()
@@ -789,14 +994,29 @@ class AmbilightController:
                 return
 
             self.status_label.config(text="Connecting...", foreground="orange")
-            self.root.update()
+            self.root.update_idletasks()
 
-            if self.conn.connect_websocket(ip):
-                self.status_label.config(
-                    text=f"Connected (WS: {ip})", foreground="green"
-                )
-            else:
-                self.status_label.config(text="Connection Failed", foreground="red")
+            self._connect_in_background(
+                self.conn.connect_websocket, ip, f"Connected (WS: {ip})"
+            )
+
+    def _connect_in_background(self, connect, target, connected_text):
+        """Run a blocking connect call off the Tk thread."""
+        self._connecting = True
+
+        def worker():
+            ok = connect(target)
+            self.root.after(0, lambda: self._finish_connect(ok, connected_text))
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _finish_connect(self, ok, connected_text):
+        """Update connection status once the connect attempt finished."""
+        self._connecting = False
+        if ok:
+            self.status_label.config(text=connected_text, foreground="green")
+        else:
+            self.status_label.config(text="Connection Failed", foreground="red")
 
     def disconnect_device(self):
         """Disconnect from device."""
@@ -867,20 +1087,20 @@ class AmbilightController:
             )
 
     def _on_connected(self, mode, details):
-        """Callback when connection established."""
-        self.num_leds = self.conn.led_count
-        self.initialize_led_positions()
+        """Callback when connection established (runs on the connecting thread)."""
+        led_count = self.conn.led_count
 
+        # LED re-init redraws the map canvas, so it must run on the Tk thread
         def update_ui():
+            self.num_leds = led_count
+            self.initialize_led_positions()
             self.info_label.config(
                 text=f"Connected! Found {self.num_leds} LEDs. Ready to calibrate."
             )
-            if hasattr(self, "led_count_var"):
-                self.led_count_var.set(str(self.num_leds))
-            if hasattr(self, "led_count_label"):
-                self.led_count_label.config(
-                    text=f"(synced: {self.num_leds})", foreground="green"
-                )
+            self.led_count_var.set(str(self.num_leds))
+            self.led_count_label.config(
+                text=f"(synced: {self.num_leds})", foreground="green"
+            )
 
         self.root.after(0, update_ui)
 
@@ -891,22 +1111,22 @@ class AmbilightController:
         )
 
     def _on_message(self, data):
-        """Handle message from device."""
+        """Handle message from device (runs on the connection's thread)."""
         if data.get("type") == "info":
             new_led_count = data.get("ledCount", 60)
-            if new_led_count != self.num_leds:
-                print(f"[App] Updating LED count: {self.num_leds} -> {new_led_count}")
-                self.num_leds = new_led_count
-                self.initialize_led_positions()
 
-            # Update UI on the main thread
+            # Update LEDs and UI on the main thread
             def update_ui():
-                if hasattr(self, "led_count_var"):
-                    self.led_count_var.set(str(new_led_count))
-                if hasattr(self, "led_count_label"):
-                    self.led_count_label.config(
-                        text=f"(synced: {new_led_count})", foreground="green"
+                if new_led_count != self.num_leds:
+                    print(
+                        f"[App] Updating LED count: {self.num_leds} -> {new_led_count}"
                     )
+                    self.num_leds = new_led_count
+                    self.initialize_led_positions()
+                self.led_count_var.set(str(new_led_count))
+                self.led_count_label.config(
+                    text=f"(synced: {new_led_count})", foreground="green"
+                )
 
             self.root.after(0, update_ui)
 
@@ -916,74 +1136,137 @@ class AmbilightController:
 
     # ===== LED Calibration =====
 
+    @property
+    def led_positions(self):
+        """LED positions as a list of {"x", "y"} dicts (config/JSON form)."""
+        return [{"x": x, "y": y} for x, y in self.led_positions_arr.tolist()]
+
+    @led_positions.setter
+    def led_positions(self, positions):
+        self.led_positions_arr = np.array(
+            [[p["x"], p["y"]] for p in positions], dtype=np.float32
+        ).reshape(-1, 2)
+
     def initialize_led_positions(self):
         """Initialize LED positions with default grid layout."""
         # Trim excess positions if num_leds decreased
-        if len(self.led_positions) > self.num_leds:
-            self.led_positions = self.led_positions[: self.num_leds]
+        existing = self.led_positions_arr[: self.num_leds]
 
         # Add positions for any missing LEDs using grid layout
         cols = int(np.ceil(np.sqrt(self.num_leds)))
         rows = int(np.ceil(self.num_leds / cols))
 
-        for i in range(len(self.led_positions), self.num_leds):
-            row = i // cols
-            col = i % cols
+        idx = np.arange(len(existing), self.num_leds)
+        grid = np.full((len(idx), 2), 0.5, dtype=np.float32)
+        if cols > 1:
+            grid[:, 0] = (idx % cols) / (cols - 1)
+        if rows > 1:
+            grid[:, 1] = (idx // cols) / (rows - 1)
 
-            x = col / max(cols - 1, 1) if cols > 1 else 0.5
-            y = row / max(rows - 1, 1) if rows > 1 else 0.5
+        self.led_positions_arr = np.concatenate([existing, grid])
 
-            self.led_positions.append({"x": x, "y": y})
+        # Smoothing state sized for the new LED count
+        with self._lock:
+            self.prev_colors = np.zeros((self.num_leds, 3), dtype=np.float32)
+            self._prev_colors_valid = False
 
         self.draw_led_map()
 
-    def draw_led_map(self):
-        """Draw LED positions on canvas."""
+    def _create_led_map_items(self, count):
+        """Create the canvas items for the LED map; positioned later via coords()."""
         self.canvas.delete("all")
 
+        # Screen rectangle and corner labels, pre-rendered as one image
+        backdrop = self.canvas.create_image(0, 0, anchor="nw")
+        self._backdrop_size = None
+
+        # LED dots and their number labels
+        leds = [
+            self.canvas.create_oval(0, 0, 0, 0, outline="white", width=2)
+            for _ in range(count)
+        ]
+        labels = [
+            self.canvas.create_text(
+                0, 0, text=str(i), fill="white", font=("Arial", 9, "bold")
+            )
+            for i in range(count)
+        ]
+
+        self._canvas_items = {
+            "count": count,
+            "backdrop": backdrop,
+            "leds": leds,
+            "labels": labels,
+            # Last drawn (geometry, color/visibility) per item, to skip no-op updates
+            "led_state": [None] * count,
+            "label_state": [None] * count,
+        }
+
+    def _render_led_map_backdrop(self, w, h, margin):
+        """Render the dashed screen outline and corner labels into a PhotoImage."""
+        bg = Image.new("RGB", (w, h), "black")
+        draw = ImageDraw.Draw(bg)
+        outline = "#bebebe"  # Tk's "gray"
+
+        # Dashed outline: 5px on, 5px off, 3px wide
+        x0, y0, x1, y1 = margin, margin, w - margin, h - margin
+        for x in range(x0, x1, 10):
+            xe = min(x + 5, x1)
+            draw.line([(x, y0), (xe, y0)], fill=outline, width=3)
+            draw.line([(x, y1), (xe, y1)], fill=outline, width=3)
+        for y in range(y0, y1, 10):
+            ye = min(y + 5, y1)
+            draw.line([(x0, y), (x0, ye)], fill=outline, width=3)
+            draw.line([(x1, y), (x1, ye)], fill=outline, width=3)
+
+        # Corner labels, centered on their anchor points
+        font = ImageFont.load_default()
+        corners = [
+            ("TOP-LEFT", margin - 20, margin - 20),
+            ("TOP-RIGHT", w - margin + 20, margin - 20),
+            ("BOTTOM-LEFT", margin - 20, h - margin + 20),
+            ("BOTTOM-RIGHT", w - margin + 20, h - margin + 20),
+        ]
+        for text, cx, cy in corners:
+            left, top, right, bottom = draw.textbbox((0, 0), text, font=font)
+            draw.text(
+                (cx - (right - left) / 2 - left, cy - (bottom - top) / 2 - top),
+                text,
+                fill=outline,
+                font=font,
+            )
+
+        return ImageTk.PhotoImage(bg)
+
+    def draw_led_map(self):
+        """Draw LED positions on canvas."""
         w = self.canvas.winfo_width()
         h = self.canvas.winfo_height()
 
         if w <= 1 or h <= 1:
             return
 
+        positions = self.led_positions_arr.astype(np.float64)
+        if self._canvas_items.get("count") != len(positions):
+            self._create_led_map_items(len(positions))
+        items = self._canvas_items
+
         margin = 40
 
-        # Draw screen rectangle
-        self.canvas.create_rectangle(
-            margin, margin, w - margin, h - margin, outline="gray", width=3, dash=(5, 5)
-        )
+        # Screen rectangle and corner labels (re-rendered only on resize)
+        if self._backdrop_size != (w, h):
+            self._backdrop_photo = self._render_led_map_backdrop(w, h, margin)
+            self._backdrop_size = (w, h)
+            self.canvas.itemconfig(items["backdrop"], image=self._backdrop_photo)
 
-        # Draw corner labels
-        self.canvas.create_text(
-            margin - 20, margin - 20, text="TOP-LEFT", fill="gray", font=("Arial", 8)
-        )
-        self.canvas.create_text(
-            w - margin + 20,
-            margin - 20,
-            text="TOP-RIGHT",
-            fill="gray",
-            font=("Arial", 8),
-        )
-        self.canvas.create_text(
-            margin - 20,
-            h - margin + 20,
-            text="BOTTOM-LEFT",
-            fill="gray",
-            font=("Arial", 8),
-        )
-        self.canvas.create_text(
-            w - margin + 20,
-            h - margin + 20,
-            text="BOTTOM-RIGHT",
-            fill="gray",
-            font=("Arial", 8),
-        )
+        # Canvas coordinates for every LED in one vectorized pass
+        xs = (margin + positions[:, 0] * (w - 2 * margin)).tolist()
+        ys = (margin + positions[:, 1] * (h - 2 * margin)).tolist()
 
-        # Draw LEDs
-        for i, led in enumerate(self.led_positions):
-            x = margin + led["x"] * (w - 2 * margin)
-            y = margin + led["y"] * (h - 2 * margin)
+        # LEDs - only touch items whose position or look actually changed
+        led_states = items["led_state"]
+        label_states = items["label_state"]
+        for i, (x, y) in enumerate(zip(xs, ys)):
 
             if self.calibration_mode and i == self.current_led_index:
                 color = "yellow"
@@ -995,24 +1278,26 @@ class AmbilightController:
                 color = "cyan"
                 size = 5
 
-            self.canvas.create_oval(
-                x - size,
-                y - size,
-                x + size,
-                y + size,
-                fill=color,
-                outline="white",
-                width=2,
-            )
+            led_state = (x, y, size, color)
+            if led_state != led_states[i]:
+                led_states[i] = led_state
+                oval = items["leds"][i]
+                self.canvas.coords(oval, x - size, y - size, x + size, y + size)
+                self.canvas.itemconfig(oval, fill=color)
 
             # Label LEDs (every 5th for larger counts, all for small counts)
-            if (
+            show_label = (
                 self.num_leds <= 20
                 or i % 5 == 0
                 or (self.calibration_mode and i == self.current_led_index)
-            ):
-                self.canvas.create_text(
-                    x, y - 15, text=str(i), fill="white", font=("Arial", 9, "bold")
+            )
+            label_state = (x, y, show_label)
+            if label_state != label_states[i]:
+                label_states[i] = label_state
+                label = items["labels"][i]
+                self.canvas.coords(label, x, y - 15)
+                self.canvas.itemconfig(
+                    label, state="normal" if show_label else "hidden"
                 )
 
     def start_calibration(self):
@@ -1049,32 +1334,53 @@ class AmbilightController:
         x = max(0, min(1, (event.x - margin) / (w - 2 * margin)))
         y = max(0, min(1, (event.y - margin) / (h - 2 * margin)))
 
-        self.led_positions[self.current_led_index] = {"x": x, "y": y}
+        self.led_positions_arr[self.current_led_index] = (x, y)
         self.current_led_index += 1
 
         if self.current_led_index < self.num_leds:
-            self.conn.send_command({"cmd": "highlight", "led": self.current_led_index})
             self.info_label.config(
                 text=f"🎯 Calibrating LED {self.current_led_index}/{self.num_leds}\n"
                 f"Click where this LED is located on your screen.",
                 foreground="orange",
             )
-            self.draw_led_map()
+            # Coalesce fast clicks into one highlight command and one redraw
+            if not self._calibration_update_scheduled:
+                self._calibration_update_scheduled = True
+                self.root.after(16, self._flush_calibration_update)
         else:
             self.finish_calibration()
 
+    def _flush_calibration_update(self):
+        """Highlight the LED being calibrated and redraw the map once."""
+        self._calibration_update_scheduled = False
+        if self.calibration_mode:
+            self.conn.send_command({"cmd": "highlight", "led": self.current_led_index})
+            self.draw_led_map()
+
     def finish_calibration(self):
         """Complete calibration and save mapping."""
         self.calibration_mode = False
 
-        # Send mapping to device
-        mapping = [
-            {"x": int(led["x"] * 255), "y": int(led["y"] * 255)}
-            for led in self.led_positions
-        ]
-
-        self.conn.send_command({"cmd": "save_map", "mapping": mapping})
-        self.conn.send_command({"cmd": "calibrate_end"})
+        end_sent = False
+        if self.conn.supports_packed_map:
+            # Send mapping to device as packed x,y bytes per LED
+            packed = (np.clip(self.led_positions_arr, 0, 1) * 255).astype(np.uint8)
+            data = base64.b64encode(packed.tobytes()).decode("ascii")
+            cmd = {"cmd": "save_map_packed", "data": data}
+            if self.conn.supports_map_end:
+                # Saves the map and ends calibration in one command
+                cmd["end"] = True
+                end_sent = True
+            self.conn.send_command(cmd)
+        else:
+            # Firmware without packedMap only knows the per-LED mapping
+            mapping = [
+                {"x": int(x * 255), "y": int(y * 255)}
+                for x, y in self.led_positions_arr.tolist()
+            ]
+            self.conn.send_command({"cmd": "save_map", "mapping": mapping})
+        if not end_sent:
+            self.conn.send_command({"cmd": "calibrate_end"})
 
         self.info_label.config(
             text="✅ Calibration complete! Configuration saved.\n"
@@ -1106,8 +1412,7 @@ class AmbilightController:
         }
 
         try:
-            with open("ambilight_config.json", "w") as f:
-                json.dump(config_data, f, indent=2)
+            _write_json("ambilight_config.json", config_data)
             messagebox.showinfo(
                 "Success", "Configuration saved to ambilight_config.json"
             )
@@ -1117,8 +1422,7 @@ class AmbilightController:
     def load_config(self):
         """Load configuration from file."""
         try:
-            with open("ambilight_config.json", "r") as f:
-                config_data = json.load(f)
+            config_data = _read_json("ambilight_config.json")
 
             self.num_leds = config_data.get("num_leds", 60)
             self.led_positions = config_data.get("led_positions", [])
@@ -1143,6 +1447,7 @@ class AmbilightController:
                 monitors = list(self.monitor_combo["values"])
                 if saved_monitor in monitors:
                     self.selected_monitor.set(saved_monitor)
+                    self._update_monitor_bbox()
 
             self.draw_led_map()
             messagebox.showinfo("Success", "Configuration loaded")
@@ -1156,7 +1461,7 @@ class AmbilightController:
 
     def _rgb_to_hex(self, rgb):
         """Convert RGB tuple to hex color string."""
-        return f"#{rgb[0]:02x}{rgb[1]:02x}{rgb[2]:02x}"
+        return _rgb_to_hex_cached(tuple(rgb))
 
     def _load_presets(self):
         """Load presets from file and merge with defaults."""
@@ -1167,10 +1472,9 @@ class AmbilightController:
         try:
             presets_path = os.path.join(os.path.dirname(__file__), config.PRESETS_FILE)
             if os.path.exists(presets_path):
-                with open(presets_path, "r") as f:
-                    user_presets = json.load(f)
-                    for name, rgb in user_presets.items():
-                        self.presets[name] = tuple(rgb)
+                user_presets = _read_json(presets_path)
+                for name, rgb in user_presets.items():
+                    self.presets[name] = tuple(rgb)
         except Exception as e:
             print(f"Error loading presets: {e}")
 
@@ -1183,11 +1487,27 @@ class AmbilightController:
 
         try:
             presets_path = os.path.join(os.path.dirname(__file__), config.PRESETS_FILE)
-            with open(presets_path, "w") as f:
-                json.dump(user_presets, f, indent=2)
+            # Write to a temp file and swap it in so a crash can't truncate it
+            tmp_path = presets_path + ".tmp"
+            _write_json(tmp_path, user_presets)
+            os.replace(tmp_path, presets_path)
         except Exception as e:
             print(f"Error saving presets: {e}")
 
+    def _mark_presets_dirty(self):
+        """Schedule a deferred save after presets change."""
+        self._presets_dirty = True
+        if not self._presets_flush_scheduled:
+            self._presets_flush_scheduled = True
+            self.root.after(500, self._flush_presets_if_dirty)
+
+    def _flush_presets_if_dirty(self):
+        """Write presets to disk if they changed since the last save."""
+        self._presets_flush_scheduled = False
+        if self._presets_dirty:
+            self._presets_dirty = False
+            self._save_presets_to_file()
+
     def _update_preset_dropdown(self):
         """Update preset dropdown with current presets."""
         self.preset_combo["values"] = list(self.presets.keys())
@@ -1216,7 +1536,7 @@ class AmbilightController:
         if name and name.strip():
             name = name.strip()
             self.presets[name] = self.static_color
-            self._save_presets_to_file()
+            self._mark_presets_dirty()
             self._update_preset_dropdown()
             self.selected_preset.set(name)
             messagebox.showinfo("Success", f"Preset '{name}' saved!")
@@ -1234,7 +1554,7 @@ class AmbilightController:
 
         if messagebox.askyesno("Confirm", f"Delete preset '{name}'?"):
             del self.presets[name]
-            self._save_presets_to_file()
+            self._mark_presets_dirty()
             self._update_preset_dropdown()
             self.selected_preset.set("")
             messagebox.showinfo("Success", f"Preset '{name}' deleted")
@@ -1264,30 +1584,82 @@ class AmbilightController:
         # Screen Capture mode is handled normally in capture_loop
 
     def _run_effect_loop(self):
-        """Run effects independently when capture is not running."""
+        """
+        Run effects independently when capture is not running.
+        Frames are generated on a helper thread into a two-slot buffer, so
+        the next frame is computed while the current one is transmitted.
+        """
         fps = 30
         delay = 1.0 / fps
 
-        while self.effect_running and not self.is_running:
-            if self.output_mode.get() != "Effect":
-                break
+        buffers = [None, None]
+        front = 0
+        frame_ready = threading.Event()
+        frame_taken = threading.Event()
+        frame_taken.set()
+        stopped = threading.Event()
+
+        def running():
+            return (
+                self.effect_running
+                and not self.is_running
+                and not stopped.is_set()
+                and self._output_mode_cached == "Effect"
+            )
+
+        def generate():
+            nonlocal front
+            effect_name = None
+            effect_func = None
+            last = time.monotonic()
 
             try:
-                effect_name = self.current_effect.get()
-                if effect_name in effects.EFFECTS:
-                    effect_func = effects.EFFECTS[effect_name]
-                    led_colors = effect_func(
+                while running():
+                    name = self._current_effect_cached
+                    if name != effect_name:
+                        effect_name = name
+                        effect_func = effects.get_effect(name)
+
+                    back = 1 - front
+                    buffers[back] = effect_func(
                         self.num_leds, self.current_brightness, self.effect_phase
                     )
-                    self.conn.send_colors(bytes(led_colors))
-                    self.effect_phase += 0.02 * self.effect_speed.get()
+
+                    # Advance phase by elapsed time, independent of send jitter
+                    now = time.monotonic()
+                    self.effect_phase += (
+                        0.02 * fps * self._effect_speed_cached * (now - last)
+                    )
+                    last = now
                     if self.effect_phase > 100:
                         self.effect_phase = 0
+
+                    # Hand over once the sender has taken the previous frame
+                    while not frame_taken.wait(delay):
+                        if not running():
+                            return
+                    frame_taken.clear()
+                    front = back
+                    frame_ready.set()
             except Exception as e:
                 print(f"Effect error: {e}")
-                break
+            finally:
+                stopped.set()
+
+        threading.Thread(target=generate, daemon=True).start()
+
+        next_frame = time.monotonic() + delay
+        while running():
+            if not frame_ready.wait(delay):
+                continue
+            frame_ready.clear()
+            led_colors = buffers[front]
+            frame_taken.set()
 
-            time.sleep(delay)
+            self.conn.send_colors(led_colors)
+            next_frame = _sleep_until(next_frame, delay)
+
+        stopped.set()
 
     def _apply_static_color(self):
         """Send static color to LEDs."""
@@ -1298,11 +1670,19 @@ class AmbilightController:
         if mode != "Static Color":
             return
 
-        r, g, b = self.static_color
-        led_colors = effects.generate_static_color(
-            self.num_leds, self.current_brightness, r, g, b
-        )
-        self.conn.send_colors(bytes(led_colors))
+        self.conn.send_colors(self._static_color_frame())
+
+    def _static_color_frame(self):
+        """Static color frame, rebuilt only when the color/brightness/count change."""
+        key = (self.static_color, self.current_brightness, self.num_leds)
+        cached = self._static_frame
+        if cached is None or cached[0] != key:
+            r, g, b = self.static_color
+            frame = effects.generate_static_color(
+                self.num_leds, self.current_brightness, r, g, b
+            )
+            cached = self._static_frame = (key, frame)
+        return cached[1]
 
     def force_clear_leds(self):
         """Force turn off all LEDs."""
@@ -1318,7 +1698,7 @@ class AmbilightController:
 
         # Also send all black colors
         led_colors = bytearray([0, 0, 0] * self.num_leds)
-        self.conn.send_colors(bytes(led_colors))
+        self.conn.send_colors(led_colors)
 
         self.status_bar.config(text="LEDs cleared")
 
@@ -1333,8 +1713,6 @@ class AmbilightController:
         icon_size = 64
         icon_image = Image.new("RGB", (icon_size, icon_size), color=(50, 50, 50))
         # Draw a simple LED-like circle
-        from PIL import ImageDraw
-
         draw = ImageDraw.Draw(icon_image)
         draw.ellipse([8, 8, 56, 56], fill=(255, 147, 41), outline=(255, 200, 100))
 
@@ -1388,7 +1766,12 @@ class AmbilightController:
         if self.tray_icon:
             self.tray_icon.stop()
         self.is_running = False
-        self.root.after(0, self.root.destroy)
+        self.root.after(0, self._destroy)
+
+    def _destroy(self):
+        """Flush pending state and destroy the window (main thread)."""
+        self._flush_presets_if_dirty()
+        self.root.destroy()
 
     # ===== Ambilight Capture =====
 
@@ -1410,189 +1793,213 @@ class AmbilightController:
         """Stop the ambilight capture loop."""
         with self._lock:
             self.is_running = False
-            self.prev_colors = None
+            self._prev_colors_valid = False
 
         self.start_btn.config(state="normal")
         self.stop_btn.config(state="disabled")
         self.status_bar.config(text="Ambilight stopped")
-        # Test LED strip
-        self.test_pattern()
-        if self.conn.connected:
-            self.conn.send_command({"cmd": "clear"})
 
         # turn off all leds
         self.conn.send_command({"cmd": "clear"})
 
+    @staticmethod
+    def _downsample_frame(frame):
+        """Downscale a captured frame to the ~160 px wide image processors use."""
+        # Integer striding keeps the aspect ratio. The processors only
+        # average regions, so nearest sampling is enough and avoids a
+        # filtered resize over the full-resolution frame.
+        sh, sw = frame.shape[:2]
+        target_w = 160
+        target_h = max(1, int(target_w * (sh / sw)))
+        sx = max(1, sw // target_w)
+        sy = max(1, sh // target_h)
+        return np.ascontiguousarray(frame[::sy, ::sx])
+
+    def _process_frame(self, pixels, mode, brightness, positions):
+        """Turn a downsampled frame into LED colors for mode."""
+        # Process based on capture mode
+        processor = image_processor.PROCESSORS.get(mode)
+        if processor is not None:
+            led_colors = processor(pixels, brightness, self.num_leds)
+
+        else:  # Screen Map
+            # Sampling LUT only changes with the frame size or the LED map
+            lut_key = (pixels.shape[:2], self.num_leds, positions.tobytes())
+            if self._screen_map_lut is None or self._screen_map_lut[0] != lut_key:
+                lut = image_processor.screen_map_lut(
+                    positions, self.num_leds, pixels.shape[1], pixels.shape[0]
+                )
+                self._screen_map_lut = (lut_key, lut)
+            led_colors = image_processor.process_screen_map(
+                pixels,
+                brightness,
+                self.num_leds,
+                positions,
+                self._screen_map_lut[1],
+            )
+
+        return led_colors
+
+    def _grab_frames(self, frames, done):
+        """Grab the screen at the target FPS, keeping only the newest frame queued."""
+        _raise_thread_priority()
+        next_frame = time.monotonic()
+        while self.is_running and not done.is_set():
+            delay = 1.0 / self._fps_cached
+            if self._output_mode_cached != "Screen Capture":
+                next_frame = _sleep_until(next_frame, delay)
+                continue
+
+            try:
+                frame = screen_capture.grab(self._capture_bbox)
+            except Exception as e:
+                print(f"Capture error: {e}")
+                time.sleep(0.1)
+                continue
+
+            # Drop a frame the consumer hasn't taken yet (only we put, so no race)
+            try:
+                frames.get_nowait()
+            except queue.Empty:
+                pass
+            frames.put(frame)
+            next_frame = _sleep_until(next_frame, delay)
+
     def capture_loop(self):
         """Main capture loop - runs in background thread."""
-        fps = int(self.fps_var.get())
+        _raise_thread_priority()
+
+        # Screen grabs run on their own thread so they overlap processing
+        frames = queue.Queue(maxsize=1)
+        grab_done = threading.Event()
+        threading.Thread(
+            target=self._grab_frames, args=(frames, grab_done), daemon=True
+        ).start()
+
+        try:
+            self._capture_frames(frames)
+        finally:
+            grab_done.set()
+
+    def _capture_frames(self, frames):
+        """Consumer side of capture_loop: process and send frames until stopped."""
+        fps = self._fps_cached
         delay = 1.0 / fps
         frame_count = 0
+        effect_name = None
+        effect_func = None
+        last_idle_key = None
+        last_processed = None
+        next_frame = time.monotonic() + delay
 
         while self.is_running:
             try:
+                # Pick up FPS changes without restarting the loop
+                if self._fps_cached != fps:
+                    fps = self._fps_cached
+                    delay = 1.0 / fps
+
                 # Check output mode
-                output_mode = self.output_mode.get()
+                output_mode = self._output_mode_cached
 
                 # Handle Static Color mode
                 if output_mode == "Static Color":
-                    r, g, b = self.static_color
-                    led_colors = effects.generate_static_color(
-                        self.num_leds, self.current_brightness, r, g, b
-                    )
-                    self.conn.send_colors(bytes(led_colors))
-                    time.sleep(delay)
+                    self.conn.send_colors(self._static_color_frame())
+                    next_frame = _sleep_until(next_frame, delay)
                     continue
 
                 # Handle Effect mode
                 if output_mode == "Effect":
-                    effect_name = self.current_effect.get()
-                    if effect_name in effects.EFFECTS:
-                        effect_func = effects.EFFECTS[effect_name]
-                        led_colors = effect_func(
-                            self.num_leds, self.current_brightness, self.effect_phase
-                        )
-                        self.conn.send_colors(bytes(led_colors))
-                        # Advance phase based on speed
-                        self.effect_phase += 0.02 * self.effect_speed.get()
-                        if self.effect_phase > 100:
-                            self.effect_phase = 0
-                    time.sleep(delay)
-                    continue
-
-                # Screen Capture mode - get selected monitor bounds
-                monitor_bbox = self.get_selected_monitor_bbox()
-
-                # Calculate capture region
-                if monitor_bbox:
-                    mx, my, mx2, my2 = monitor_bbox
-                    mw, mh = mx2 - mx, my2 - my
-
-                    if self.use_custom_region.get():
-                        # Custom region WITHIN the selected monitor
-                        try:
-                            rx = mx + int(int(self.region_x.get() or "0") / 100 * mw)
-                            ry = my + int(int(self.region_y.get() or "0") / 100 * mh)
-                            rw = int(int(self.region_w.get() or "100") / 100 * mw)
-                            rh = int(int(self.region_h.get() or "100") / 100 * mh)
-                            bbox = (rx, ry, rx + rw, ry + rh)
-                        except Exception as e:
-                            print(f"Region calc error: {e}")
-                            bbox = monitor_bbox
-                    else:
-                        bbox = monitor_bbox
-                else:
-                    # Fallback: primary monitor only
-                    bbox = None
-                    if self.use_custom_region.get():
-                        try:
-                            if self._screen_size is None:
-                                full_screen = ImageGrab.grab()
-                                self._screen_size = full_screen.size
-                            sw, sh = self._screen_size
-
-                            rx = int(int(self.region_x.get() or "0") / 100 * sw)
-                            ry = int(int(self.region_y.get() or "0") / 100 * sh)
-                            rw = int(int(self.region_w.get() or "100") / 100 * sw)
-                            rh = int(int(self.region_h.get() or "100") / 100 * sh)
-
-                            rx = max(0, min(rx, sw - 1))
-                            ry = max(0, min(ry, sh - 1))
-                            rw = max(1, min(rw, sw - rx))
-                            rh = max(1, min(rh, sh - ry))
-
-                            bbox = (rx, ry, rx + rw, ry + rh)
-                        except Exception as e:
-                            print(f"Region calc error: {e}")
-                            bbox = None
+                    name = self._current_effect_cached
+                    if name != effect_name:
+                        effect_name = name
+                        effect_func = effects.get_effect(name)
 
-                # Capture screen
-                screen = ImageGrab.grab(bbox=bbox, all_screens=True)
-
-                # Resize keeping aspect ratio to avoid distortion
-                sw, sh = screen.size
-                target_w = 160
-                target_h = max(1, int(target_w * (sh / sw)))
-                screen = screen.resize((target_w, target_h))
-
-                pixels = np.array(screen)
+                    led_colors = effect_func(
+                        self.num_leds, self.current_brightness, self.effect_phase
+                    )
+                    self.conn.send_colors(led_colors)
+                    # Advance phase based on speed
+                    self.effect_phase += 0.02 * self._effect_speed_cached
+                    if self.effect_phase > 100:
+                        self.effect_phase = 0
+                    next_frame = _sleep_until(next_frame, delay)
+                    continue
 
-                h, w = pixels.shape[:2]
+                # Screen Capture mode - wait for the grab thread's next frame
+                try:
+                    frame = frames.get(timeout=0.1)
+                except queue.Empty:
+                    continue
 
                 # Use thread-safe variable
                 brightness = self.current_brightness
+                mode = self._capture_mode_cached
 
-                led_colors = bytearray()
-                mode = self.capture_mode.get()
-
-                # Process based on capture mode
-                if mode == "Average Color":
-                    led_colors = image_processor.process_average_color(
-                        pixels, brightness, self.num_leds
-                    )
-
-                elif mode == "Dominant Color":
-                    led_colors = image_processor.process_dominant_color(
-                        pixels, brightness, self.num_leds
-                    )
-
-                elif mode == "Edge Sampling":
-                    led_colors = image_processor.process_edge_sampling(
-                        pixels, brightness, self.num_leds
-                    )
-
-                elif mode == "Quadrant Colors":
-                    led_colors = image_processor.process_quadrant_colors(
-                        pixels, brightness, self.num_leds
-                    )
-
-                elif mode == "Most Vibrant":
-                    led_colors = image_processor.process_most_vibrant(
-                        pixels, brightness, self.num_leds
-                    )
-
-                elif mode == "Warm Bias":
-                    led_colors = image_processor.process_warm_bias(
-                        pixels, brightness, self.num_leds
-                    )
-
-                elif mode == "Cool Bias":
-                    led_colors = image_processor.process_cool_bias(
-                        pixels, brightness, self.num_leds
-                    )
-
-                else:  # Screen Map
+                current_positions = None
+                if mode == "Screen Map":
                     # Thread-safe copy of positions
                     with self._lock:
-                        current_positions = list(self.led_positions)
+                        current_positions = self.led_positions_arr.copy()
+
+                pixels = self._downsample_frame(frame)
+
+                # Reuse the last result while the pixels we process are unchanged
+                idle_key = None
+                if self._skip_idle_cached:
+                    idle_key = (
+                        zlib.crc32(pixels),
+                        pixels.shape,
+                        mode,
+                        brightness,
+                        self.num_leds,
+                        None
+                        if current_positions is None
+                        else zlib.crc32(current_positions.tobytes()),
+                    )
 
-                    led_colors = image_processor.process_screen_map(
-                        pixels, brightness, self.num_leds, current_positions
+                if idle_key is not None and idle_key == last_idle_key:
+                    led_colors = last_processed
+                else:
+                    led_colors = self._process_frame(
+                        pixels, mode, brightness, current_positions
                     )
+                    last_idle_key = idle_key
+                    last_processed = led_colors
 
                 # Apply smoothing with thread safety
                 smooth_factor = self.current_smoothing
 
                 with self._lock:
-                    if self.prev_colors is not None and len(self.prev_colors) == len(
-                        led_colors
-                    ):
-                        smoothed = bytearray(len(led_colors))
-                        for i in range(len(led_colors)):
-                            smoothed[i] = int(
-                                self.prev_colors[i] * smooth_factor
-                                + led_colors[i] * (1 - smooth_factor)
-                            )
-                        led_colors = smoothed
+                    current = np.frombuffer(led_colors, dtype=np.uint8).reshape(-1, 3)
+                    prev = self.prev_colors
+                    if prev is None or prev.shape != current.shape:
+                        prev = self.prev_colors = np.zeros(
+                            current.shape, dtype=np.float32
+                        )
+                        self._prev_colors_valid = False
 
-                    self.prev_colors = bytearray(led_colors)
+                    if self._prev_colors_valid and smooth_factor > 0:
+                        out = self._smooth_out
+                        if out is None or out.size != current.size:
+                            out = self._smooth_out = np.empty(
+                                current.size, dtype=np.uint8
+                            )
+                        image_processor.smooth_colors(
+                            prev.reshape(-1), current.reshape(-1), smooth_factor, out
+                        )
+                        led_colors = out.tobytes()
+                    else:
+                        # No smoothing: just track the frame for when it's enabled
+                        prev[:] = current
+                        self._prev_colors_valid = True
 
                 # Send to device
-                self.conn.send_colors(bytes(led_colors))
+                self.conn.send_colors(led_colors)
 
-                # Debug logging
+                # Debug logging (set AMBILIGHT_DEBUG=1 to enable)
                 frame_count += 1
-                if frame_count % 30 == 0:
+                if config.DEBUG_LOG and frame_count % 30 == 0:
                     sample = []
                     for i in range(min(3, self.num_leds)):
                         idx = i * 3
@@ -1604,7 +2011,7 @@ class AmbilightController:
                         f"[Frame {frame_count}] Mode: {mode} | {', '.join(sample)}..."
                     )
 
-                time.sleep(delay)
+                # No sleep here: the grab thread paces capture frames
 
             except Exception as e:
                 print(f"Capture error: {e}")
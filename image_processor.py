@@ -1,135 +1,325 @@
 import numpy as np
 
+# Optional import for JIT-compiled kernels (falls back to NumPy ops)
+try:
+    from numba import njit, prange
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def _smooth_colors_numpy(prev, current, factor, out):
+    np.multiply(prev, factor, out=prev)
+    prev += current * np.float32(1 - factor)
+    np.copyto(out, prev, casting="unsafe")
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(cache=True)
+    def _smooth_colors_jit(prev, current, factor, out):
+        keep = np.float32(factor)
+        take = np.float32(1 - factor)
+        for i in range(prev.size):
+            value = prev[i] * keep + current[i] * take
+            prev[i] = value
+            out[i] = np.uint8(value)
+
+
+def _channel_max_min(flat_pixels):
+    """Per-pixel max (as int32) and min of an (N, 3) uint8 array."""
+    # Elementwise over the channel columns beats max(axis=1) on a 3-wide axis
+    r, g, b = flat_pixels[:, 0], flat_pixels[:, 1], flat_pixels[:, 2]
+    max_vals = np.maximum(np.maximum(r, g), b).astype(np.int32)
+    min_vals = np.minimum(np.minimum(r, g), b)
+    return max_vals, min_vals
+
+
+# Fixed-point reciprocals: (spread * _SAT_RECIP[mx]) >> 16 == spread * 255 // mx
+# exactly for 0 <= spread <= mx <= 255 (rounding up makes the floor come out
+# right); _SAT_RECIP[0] = 0 maps black to saturation 0. Fits in uint32.
+_SAT_RECIP = np.zeros(256, dtype=np.uint32)
+_SAT_RECIP[1:] = -(-(255 << 16) // np.arange(1, 256))
+
+
+def _dominant_sums_numpy(flat_pixels):
+    max_vals, min_vals = _channel_max_min(flat_pixels)
+    saturation = ((max_vals - min_vals).astype(np.uint32) * _SAT_RECIP[max_vals]) >> 16
+
+    # Zero the weight of dull pixels instead of compacting the colorful ones
+    colorful_mask = (saturation > 50) & (max_vals > 30) & (max_vals < 240)
+    weights = np.where(colorful_mask, saturation, 0).astype(np.int64)
+    weighted = weights @ flat_pixels.astype(np.int64)
+    return weighted, int(weights.sum())
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(parallel=True, cache=True)
+    def _dominant_sums_jit(flat_pixels):
+        # One pass: saturation, mask and weighted sums fused per pixel
+        sum_r = 0
+        sum_g = 0
+        sum_b = 0
+        total = 0
+        for i in prange(flat_pixels.shape[0]):
+            r = np.int64(flat_pixels[i, 0])
+            g = np.int64(flat_pixels[i, 1])
+            b = np.int64(flat_pixels[i, 2])
+            mx = max(r, g, b)
+            if mx > 30 and mx < 240:
+                sat = ((mx - min(r, g, b)) * 255) // mx
+                if sat > 50:
+                    sum_r += r * sat
+                    sum_g += g * sat
+                    sum_b += b * sat
+                    total += sat
+        return np.array([sum_r, sum_g, sum_b]), total
+
+
+def _most_saturated_numpy(flat_pixels):
+    max_vals, min_vals = _channel_max_min(flat_pixels)
+
+    # (max - min) / max in 16.16 fixed point: two saturations with
+    # denominators <= 255 differ by more than 2**-16, so the ranking (and
+    # argmax's first-index tie break) is the same as with float division
+    saturation = ((max_vals - min_vals) << 16) // np.maximum(max_vals, 1)
+
+    return int(np.argmax(saturation))
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(cache=True)
+    def _most_saturated_jit(flat_pixels):
+        # Compare (mx - mn) / mx against the best so far by cross-multiplying,
+        # so the scan needs no division and no saturation array
+        best_num = 0
+        best_den = 1
+        best_idx = 0
+        for i in range(flat_pixels.shape[0]):
+            r = np.int32(flat_pixels[i, 0])
+            g = np.int32(flat_pixels[i, 1])
+            b = np.int32(flat_pixels[i, 2])
+            mx = max(r, g, b)
+            num = mx - min(r, g, b)
+            if num * best_den > best_num * mx:
+                best_num = num
+                best_den = mx
+                best_idx = i
+        return best_idx
+
+
+def smooth_colors(prev, current, factor, out):
+    """
+    Blend current into the float32 smoothing state in place:
+    prev = prev * factor + current * (1 - factor), truncated into uint8 out.
+    All arrays are flat and the same length.
+    """
+    if NUMBA_AVAILABLE:
+        _smooth_colors_jit(prev, current, np.float32(factor), out)
+    else:
+        _smooth_colors_numpy(prev, current, factor, out)
+
 
 def apply_brightness(r, g, b, brightness):
     """Apply brightness to RGB values with black threshold."""
     if r + g + b < 15:
         return 0, 0, 0
+    # Integer floor division: same result as int(x * brightness / 255), no floats
     return (
-        int(r * brightness / 255),
-        int(g * brightness / 255),
-        int(b * brightness / 255),
+        int(r * brightness // 255),
+        int(g * brightness // 255),
+        int(b * brightness // 255),
     )
 
 
+def mean_color(pixels):
+    """Per-channel mean of a pixel block, truncated, using integer sums only."""
+    count = max(pixels.size // pixels.shape[-1], 1)
+    if pixels.ndim == 3:
+        # Summing whole rows first keeps the inner loop contiguous (and fast)
+        pixels = pixels.sum(axis=0, dtype=np.uint32)
+    return pixels.sum(axis=0, dtype=np.int64) // count
+
+
+# Dominant color only needs a sample of the pixels to settle on a hue
+SAMPLE_PIXELS = 4096
+
+
+def sample_pixels(pixels, max_pixels=SAMPLE_PIXELS):
+    """Evenly strided view of pixels with at most about max_pixels pixels."""
+    h, w = pixels.shape[:2]
+    step = int(np.ceil(np.sqrt(h * w / max_pixels)))
+    if step <= 1:
+        return pixels
+    return pixels[::step, ::step]
+
+
+def fill_leds(r, g, b, num_leds):
+    """Frame with every LED set to the same color."""
+    return bytearray((r, g, b)) * num_leds
+
+
 def process_average_color(pixels, brightness, num_leds):
     """Calculate average color of screen."""
-    avg = np.mean(pixels, axis=(0, 1)).astype(int)
+    avg = mean_color(pixels)
     r, g, b = apply_brightness(avg[0], avg[1], avg[2], brightness)
 
-    led_colors = bytearray()
-    for _ in range(num_leds):
-        led_colors.extend([r, g, b])
-    return led_colors
+    return fill_leds(r, g, b, num_leds)
 
 
 def process_dominant_color(pixels, brightness, num_leds):
     """Extract most vibrant/saturated color from screen."""
+    pixels = sample_pixels(pixels)
     flat_pixels = pixels.reshape(-1, 3)
 
-    max_vals = np.max(flat_pixels, axis=1)
-    min_vals = np.min(flat_pixels, axis=1)
+    # Saturation-weighted sum over colorful pixels (saturation > 50, 30 < max < 240)
+    if NUMBA_AVAILABLE:
+        weighted, total_weight = _dominant_sums_jit(np.ascontiguousarray(flat_pixels))
+    else:
+        weighted, total_weight = _dominant_sums_numpy(flat_pixels)
+
+    if total_weight > 0:
+        dominant = weighted // total_weight
+        r_raw, g_raw, b_raw = dominant[0], dominant[1], dominant[2]
+    else:
+        avg = mean_color(pixels)
+        r_raw, g_raw, b_raw = avg[0], avg[1], avg[2]
+
+    r, g, b = apply_brightness(r_raw, g_raw, b_raw, brightness)
 
-    with np.errstate(divide="ignore", invalid="ignore"):
-        # Use float for calculation to avoid overflow and precision issues
-        max_vals_f = max_vals.astype(float)
-        min_vals_f = min_vals.astype(float)
-        saturation = np.where(
-            max_vals > 0, ((max_vals_f - min_vals_f) * 255.0) / max_vals_f, 0
-        ).astype(np.uint8)
+    return fill_leds(r, g, b, num_leds)
 
-    colorful_mask = (saturation > 50) & (max_vals > 30) & (max_vals < 240)
 
-    if np.any(colorful_mask):
-        colorful_pixels = flat_pixels[colorful_mask]
-        colorful_saturations = saturation[colorful_mask]
+# BRIGHTNESS_LUT[brightness][x] == x * brightness // 255 for 8-bit values
+BRIGHTNESS_LUT = (
+    np.arange(256, dtype=np.uint32)[:, np.newaxis]
+    * np.arange(256, dtype=np.uint32)
+    // 255
+).astype(np.uint8)
 
-        weights = colorful_saturations.astype(float) / 255.0
-        weighted_sum = np.sum(colorful_pixels * weights[:, np.newaxis], axis=0)
-        total_weight = np.sum(weights)
 
-        if total_weight > 0:
-            dominant = (weighted_sum / total_weight).astype(int)
-        else:
-            dominant = np.mean(colorful_pixels, axis=0).astype(int)
+def apply_brightness_array(colors, brightness, blank=None):
+    """
+    apply_brightness() for an (N, 3) array of 0-255 colors at once.
+    Rows flagged in the optional blank mask come out black as well.
+    Returns uint8.
+    """
+    out = BRIGHTNESS_LUT[brightness][colors]
+    dark = colors.sum(axis=1) < 15
+    if blank is not None:
+        dark |= blank
+    out[dark] = 0
+    return out
 
-        r_raw, g_raw, b_raw = dominant[0], dominant[1], dominant[2]
-    else:
-        avg = np.mean(flat_pixels, axis=0).astype(int)
-        r_raw, g_raw, b_raw = avg[0], avg[1], avg[2]
 
-    r, g, b = apply_brightness(r_raw, g_raw, b_raw, brightness)
+_EDGE_REGION_CACHE = {}
+
 
-    led_colors = bytearray()
-    for _ in range(num_leds):
-        led_colors.extend([r, g, b])
-    return led_colors
+def _edge_regions(num_leds, w, h, edge_width):
+    """
+    Per-LED edge regions for edge sampling (cached per layout).
+    Returns (side, start, end, strips): each LED averages strip[side] from
+    start to end along that edge; strips are (start, end) slices across it.
+    """
+    key = (num_leds, w, h, edge_width)
+    regions = _EDGE_REGION_CACHE.get(key)
+    if regions is not None:
+        return regions
+
+    leds_per_side = max(1, num_leds // 4)
+    i = np.arange(num_leds)
+    side = np.minimum(3, i // leds_per_side)  # Clamp to 0-3 for 4 sides
+    pos = i % leds_per_side
+
+    # Sides: 0 = top, 1 = right, 2 = bottom (reversed), 3 = left (reversed)
+    reverse = side >= 2
+    first = np.where(reverse, leds_per_side - 1 - pos, pos)
+    length = np.where(side % 2 == 0, w, h)
+
+    # Same float math as slicing per LED: int((pos / leds_per_side) * size)
+    start = ((first / leds_per_side) * length).astype(np.int64)
+    end = (((first + 1) / leds_per_side) * length).astype(np.int64)
+    end = np.maximum(start, end)  # Empty slices sample nothing
+
+    # Fixed strips along each edge, resolved with Python slice semantics
+    strips = (
+        slice(0, edge_width).indices(h)[:2],  # Top rows
+        slice(w - edge_width, w).indices(w)[:2],  # Right columns
+        slice(h - edge_width, h).indices(h)[:2],  # Bottom rows
+        slice(0, edge_width).indices(w)[:2],  # Left columns
+    )
+
+    regions = (side, start, end, strips)
+    _EDGE_REGION_CACHE[key] = regions
+    return regions
 
 
 def process_edge_sampling(pixels, brightness, num_leds):
     """Sample from screen edges - designed for 16 LEDs (4 per side) or more."""
     h, w = pixels.shape[:2]
     edge_width = 10
-
-    led_colors = bytearray()
-    leds_per_side = max(1, num_leds // 4)
-
-    for i in range(num_leds):
-        side = min(3, i // leds_per_side)  # Clamp to 0-3 for 4 sides
-        pos = i % leds_per_side
-
-        if side == 0:  # Top edge
-            x_start = int((pos / leds_per_side) * w)
-            x_end = int(((pos + 1) / leds_per_side) * w)
-            region = pixels[0:edge_width, x_start:x_end]
-        elif side == 1:  # Right edge
-            y_start = int((pos / leds_per_side) * h)
-            y_end = int(((pos + 1) / leds_per_side) * h)
-            region = pixels[y_start:y_end, w - edge_width : w]
-        elif side == 2:  # Bottom edge (reversed)
-            x_start = int(((leds_per_side - 1 - pos) / leds_per_side) * w)
-            x_end = int(((leds_per_side - pos) / leds_per_side) * w)
-            region = pixels[h - edge_width : h, x_start:x_end]
-        else:  # Left edge (reversed)
-            y_start = int(((leds_per_side - 1 - pos) / leds_per_side) * h)
-            y_end = int(((leds_per_side - pos) / leds_per_side) * h)
-            region = pixels[y_start:y_end, 0:edge_width]
-
-        if region.size > 0:
-            avg = np.mean(region, axis=(0, 1)).astype(int)
-            r, g, b = apply_brightness(avg[0], avg[1], avg[2], brightness)
+    side, start, end, strips = _edge_regions(num_leds, w, h, edge_width)
+
+    # Collapse each edge strip to a running sum along the edge, so any
+    # LED's region sum is two lookups: cum[end] - cum[start]
+    cums = []
+    for s, (a, b) in enumerate(strips):
+        if s % 2 == 0:
+            profile = pixels[a:b, :, :3].sum(axis=0, dtype=np.int64)
         else:
-            r, g, b = 0, 0, 0
+            profile = pixels[:, a:b, :3].sum(axis=1, dtype=np.int64)
+        cum = np.zeros((len(profile) + 1, 3), dtype=np.int64)
+        np.cumsum(profile, axis=0, out=cum[1:])
+        cums.append(cum)
 
-        led_colors.extend([r, g, b])
+    offsets = np.cumsum([0] + [len(c) for c in cums[:-1]])[side]
+    table = np.concatenate(cums)
+    sums = table[offsets + end] - table[offsets + start]
 
-    return led_colors
+    depth = np.array([max(0, b - a) for a, b in strips])[side]
+    counts = depth * (end - start)
+    avg = sums // np.maximum(counts, 1)[:, np.newaxis]
+
+    out = apply_brightness_array(avg, brightness, counts == 0)
+    return bytearray(out.tobytes())
 
 
 def process_quadrant_colors(pixels, brightness, num_leds):
     """Divide screen into 4 quadrants, assign colors to LED groups."""
     h, w = pixels.shape[:2]
+    h2, w2 = h // 2, w // 2
+    pixels = pixels[:, :, :3]
 
-    quadrants = [
-        pixels[0 : h // 2, 0 : w // 2],  # Top-left
-        pixels[0 : h // 2, w // 2 : w],  # Top-right
-        pixels[h // 2 : h, 0 : w // 2],  # Bottom-left
-        pixels[h // 2 : h, w // 2 : w],  # Bottom-right
-    ]
-
-    led_colors = bytearray()
+    if h2 and w2:
+        # Sum the (top, bottom) x (left, right) blocks in two reduceat calls
+        sums = np.add.reduceat(pixels, [0, h2], axis=0, dtype=np.uint32)
+        sums = np.add.reduceat(sums, [0, w2], axis=1, dtype=np.int64)
+    else:
+        # Frames under 2 pixels on a side: reduceat can't express empty
+        # blocks, so the top/left quadrants stay 0 and the rest is split off
+        sums = np.zeros((2, 2, 3), dtype=np.int64)
+        sums[1, 1] = pixels.sum(axis=(0, 1), dtype=np.int64)
+        if h2:
+            sums[0, 1] = pixels[:h2].sum(axis=(0, 1), dtype=np.int64)
+            sums[1, 1] -= sums[0, 1]
+        if w2:
+            sums[1, 0] = pixels[:, :w2].sum(axis=(0, 1), dtype=np.int64)
+            sums[1, 1] -= sums[1, 0]
+
+    # Pixel counts per quadrant, in top-left, top-right, bottom-left, bottom-right order
+    counts = np.outer([h2, h - h2], [w2, w - w2]).reshape(4, 1)
+    avg = sums.reshape(4, 3) // np.maximum(counts, 1)
+
+    out = apply_brightness_array(avg, brightness)
     leds_per_quad = max(1, num_leds // 4)
-
-    for q_idx, quad in enumerate(quadrants):
-        avg = np.mean(quad, axis=(0, 1)).astype(int)
-        r, g, b = apply_brightness(avg[0], avg[1], avg[2], brightness)
-
-        for _ in range(leds_per_quad):
-            led_colors.extend([r, g, b])
+    led_colors = bytearray(np.repeat(out, leds_per_quad, axis=0).tobytes())
 
     # Fill remaining LEDs if num_leds isn't divisible by 4
-    while len(led_colors) < num_leds * 3:
-        led_colors.extend([0, 0, 0])
+    if len(led_colors) < num_leds * 3:
+        led_colors += bytes(num_leds * 3 - len(led_colors))
 
     return led_colors[: num_leds * 3]
 
@@ -137,92 +327,108 @@ def process_quadrant_colors(pixels, brightness, num_leds):
 def process_most_vibrant(pixels, brightness, num_leds):
     """Find the single most saturated pixel color."""
     flat_pixels = pixels.reshape(-1, 3)
-    max_vals = np.max(flat_pixels, axis=1)
-    min_vals = np.min(flat_pixels, axis=1)
 
-    with np.errstate(divide="ignore", invalid="ignore"):
-        saturation = np.where(max_vals > 0, (max_vals - min_vals) / max_vals, 0)
-
-    max_sat_idx = np.argmax(saturation)
+    # First pixel with the highest (max - min) / max saturation
+    if NUMBA_AVAILABLE:
+        max_sat_idx = _most_saturated_jit(np.ascontiguousarray(flat_pixels))
+    else:
+        max_sat_idx = _most_saturated_numpy(flat_pixels)
     most_vibrant = flat_pixels[max_sat_idx]
 
     r, g, b = apply_brightness(
         int(most_vibrant[0]), int(most_vibrant[1]), int(most_vibrant[2]), brightness
     )
 
-    led_colors = bytearray()
-    for _ in range(num_leds):
-        led_colors.extend([r, g, b])
-    return led_colors
+    return fill_leds(r, g, b, num_leds)
 
 
 def process_warm_bias(pixels, brightness, num_leds):
     """Average color shifted warmer (more red, less blue)."""
-    avg = np.mean(pixels, axis=(0, 1)).astype(int)
+    avg = mean_color(pixels)
     r_raw = min(255, int(avg[0] * 1.3))
     g_raw = avg[1]
     b_raw = max(0, int(avg[2] * 0.7))
 
     r, g, b = apply_brightness(r_raw, g_raw, b_raw, brightness)
 
-    led_colors = bytearray()
-    for _ in range(num_leds):
-        led_colors.extend([r, g, b])
-    return led_colors
+    return fill_leds(r, g, b, num_leds)
 
 
 def process_cool_bias(pixels, brightness, num_leds):
     """Average color shifted cooler (more blue, less red)."""
-    avg = np.mean(pixels, axis=(0, 1)).astype(int)
+    avg = mean_color(pixels)
     r_raw = max(0, int(avg[0] * 0.7))
     g_raw = avg[1]
     b_raw = min(255, int(avg[2] * 1.3))
 
     r, g, b = apply_brightness(r_raw, g_raw, b_raw, brightness)
 
-    led_colors = bytearray()
-    for _ in range(num_leds):
-        led_colors.extend([r, g, b])
-    return led_colors
+    return fill_leds(r, g, b, num_leds)
 
 
-def process_screen_map(pixels, brightness, num_leds, led_positions):
-    """Sample screen at each LED's calibrated position."""
-    # Ensure we have positions for all LEDs
-    # Note: led_positions could be modified in place if we aren't careful,
-    # but here we should probably return a new list if we were to modify it.
-    # However, for pure processing, we assume led_positions is valid or we just use what we have.
+def led_pixel_indices(led_positions, width, height):
+    """Map normalized (N, 2) LED positions to integer pixel columns and rows."""
+    positions = np.asarray(led_positions, dtype=np.float64).reshape(-1, 2)
+    xs = (positions[:, 0] * (width - 1)).astype(np.int32)
+    ys = (positions[:, 1] * (height - 1)).astype(np.int32)
+    return xs, ys
 
-    # Create local copy or extend if needed (internal logic only)
-    positions = list(led_positions)
-    while len(positions) < num_leds:
-        positions.append({"x": 0.5, "y": 0.5})
 
-    h, w = pixels.shape[:2]
-    sample_radius = 1
+def screen_map_lut(led_positions, num_leds, width, height, sample_radius=1):
+    """
+    Precompute the pixels each LED averages in process_screen_map.
+    Returns (indices, valid): flat pixel indices of shape (N, k) and a mask
+    of which of them are on screen. Only depends on the LED map and the
+    frame size, so it can be reused until either changes.
+    """
+    # Pad missing LEDs with the screen center (local copy, caller's data untouched)
+    positions = np.asarray(led_positions, dtype=np.float64).reshape(-1, 2)[:num_leds]
+    if len(positions) < num_leds:
+        padding = np.full((num_leds - len(positions), 2), 0.5)
+        positions = np.concatenate([positions, padding])
 
-    led_colors = bytearray()
+    xs, ys = led_pixel_indices(positions, width, height)
 
-    # Only iterate up to num_leds to ensure correct output size
-    for i in range(num_leds):
-        led = positions[i]
-        x = int(led["x"] * (w - 1))
-        y = int(led["y"] * (h - 1))
+    offsets = np.arange(-sample_radius, sample_radius + 1)
+    dy, dx = np.meshgrid(offsets, offsets, indexing="ij")
+    x = xs[:, np.newaxis] + dx.ravel()
+    y = ys[:, np.newaxis] + dy.ravel()
 
-        # Sample small region around position
-        x_start = max(0, x - sample_radius)
-        x_end = min(w, x + sample_radius + 1)
-        y_start = max(0, y - sample_radius)
-        y_end = min(h, y + sample_radius + 1)
+    valid = (x >= 0) & (x < width) & (y >= 0) & (y < height)
+    indices = np.where(valid, y * width + x, 0)
+    return indices, valid
 
-        region = pixels[y_start:y_end, x_start:x_end]
 
-        if region.size > 0:
-            avg = np.mean(region, axis=(0, 1)).astype(int)
-            r, g, b = apply_brightness(avg[0], avg[1], avg[2], brightness)
-        else:
-            r, g, b = 0, 0, 0
-
-        led_colors.extend([r, g, b])
-
-    return led_colors
+def process_screen_map(pixels, brightness, num_leds, led_positions, lut=None):
+    """
+    Sample screen at each LED's calibrated position.
+    led_positions is an (N, 2) array of normalized (x, y) coordinates;
+    lut is an optional screen_map_lut() result for this frame size.
+    """
+    h, w = pixels.shape[:2]
+    if lut is None:
+        lut = screen_map_lut(led_positions, num_leds, w, h)
+    indices, valid = lut
+
+    # Average a small region around each position, skipping off-screen pixels
+    samples = pixels.reshape(h * w, -1)[indices, :3]
+    sums = np.where(valid[..., np.newaxis], samples, 0).sum(axis=1, dtype=np.int64)
+    counts = valid.sum(axis=1)
+
+    avg = sums // np.maximum(counts, 1)[:, np.newaxis]
+
+    out = apply_brightness_array(avg, brightness, counts == 0)
+    return bytearray(out.tobytes())
+
+
+# Capture modes that only need the frame, brightness and LED count.
+# "Screen Map" also needs the LED positions and is called separately.
+PROCESSORS = {
+    "Average Color": process_average_color,
+    "Dominant Color": process_dominant_color,
+    "Edge Sampling": process_edge_sampling,
+    "Quadrant Colors": process_quadrant_colors,
+    "Most Vibrant": process_most_vibrant,
+    "Warm Bias": process_warm_bias,
+    "Cool Bias": process_cool_bias,
+}
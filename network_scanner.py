@@ -24,6 +24,7 @@ class NetworkScanner:
         self.scanning = False
         self.devices_found: List[Dict] = []
         self._stop_event = threading.Event()
+        self._ip_range_cache = (None, frozenset())
 
     def get_all_local_ips(self) -> List[str]:
         """
@@ -53,55 +54,81 @@ class NetworkScanner:
             ("10.0.0.1", 80),  # Some networks
         ]
 
+        # UDP connect() only does a route lookup - nothing is sent, so these
+        # finish in microseconds and gain nothing from running in parallel
         for dest in test_destinations:
             try:
-                s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-                s.settimeout(0.1)
-                s.connect(dest)
-                ip = s.getsockname()[0]
+                with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+                    s.connect(dest)
+                    ip = s.getsockname()[0]
                 if not ip.startswith("127."):
                     local_ips.add(ip)
-                s.close()
             except Exception:
                 pass
 
         # Method 3: Add Windows mobile hotspot network explicitly if host is hotspot
         # Windows hotspot typically uses 192.168.137.1
         try:
-            s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            s.settimeout(0.1)
-            s.bind(("192.168.137.1", 0))
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+                s.bind(("192.168.137.1", 0))
             local_ips.add("192.168.137.1")
-            s.close()
         except Exception:
             pass
 
         return list(local_ips)
 
+    def get_arp_neighbors(self) -> List[str]:
+        """
+        IPs the OS has recently talked to, from the Linux ARP cache.
+        Returns an empty list on other platforms (no subprocess is spawned).
+        """
+        try:
+            with open("/proc/net/arp") as f:
+                lines = f.read().splitlines()[1:]
+        except OSError:
+            return []
+
+        # Columns: IP address, HW type, Flags, HW address, Mask, Device.
+        # Flags 0x0 marks an incomplete entry (the host never answered)
+        neighbors = []
+        for line in lines:
+            parts = line.split()
+            if len(parts) >= 3 and parts[2] != "0x0":
+                neighbors.append(parts[0])
+        return neighbors
+
     def get_ip_range(self) -> List[str]:
         """
         Generate list of IPs to scan based on ALL local networks.
         Scans all detected network interfaces including hotspot.
+        Hosts in the ARP cache come first so they are probed in the first wave.
         """
         all_local_ips = self.get_all_local_ips()
         if not all_local_ips:
             return []
 
-        ips = set()
-
-        for local_ip in all_local_ips:
-            parts = local_ip.split(".")
-            if len(parts) != 4:
-                continue
+        # Interfaces rarely change between scans - reuse the last range
+        key = frozenset(all_local_ips)
+        cached_key, ips = self._ip_range_cache
+        if key != cached_key:
+            bases = set()
+            for local_ip in all_local_ips:
+                parts = local_ip.split(".")
+                if len(parts) != 4:
+                    continue
+                bases.add(f"{parts[0]}.{parts[1]}.{parts[2]}")
 
-            base = f"{parts[0]}.{parts[1]}.{parts[2]}"
             # Skip .0 (network) and .255 (broadcast), skip our own IPs
-            for i in range(1, 255):
-                ip = f"{base}.{i}"
-                if ip not in all_local_ips:
-                    ips.add(ip)
+            ips = frozenset(
+                f"{base}.{i}" for base in bases for i in range(1, 255)
+            ).difference(all_local_ips)
+            self._ip_range_cache = (key, ips)
 
-        return list(ips)
+        # An idle ESP can drop out of the ARP cache, so the rest of the
+        # range is still scanned - just after the known neighbors
+        neighbors = [ip for ip in dict.fromkeys(self.get_arp_neighbors()) if ip in ips]
+        known = set(neighbors)
+        return neighbors + [ip for ip in ips if ip not in known]
 
     def check_port_open(self, ip: str, port: int) -> bool:
         """Check if a port is open on the given IP."""
@@ -142,10 +169,9 @@ class NetworkScanner:
         if self._stop_event.is_set():
             return None
 
-        # First check if WebSocket port (81) or HTTP port (80) is open
-        if self.check_port_open(ip, WEBSOCKET_PORT) or self.check_port_open(
-            ip, HTTP_PORT
-        ):
+        # The app only talks WebSocket, so a closed port 81 rules the host out
+        # before spending an HTTP request on it
+        if self.check_port_open(ip, WEBSOCKET_PORT):
             # Validate it's actually an ESP Ambilight
             device = self.validate_esp_ambilight(ip)
             if device:
@@ -0,0 +1,109 @@
+"""
+Screen capture backends.
+grab() returns the captured region as an (H, W, 3) uint8 RGB numpy array.
+"""
+
+import sys
+import threading
+import numpy as np
+from PIL import ImageGrab
+
+# Optional import for DXGI Desktop Duplication capture (Windows only)
+DXCAM_AVAILABLE = False
+if sys.platform == "win32":
+    try:
+        import dxcam
+
+        DXCAM_AVAILABLE = True
+    except ImportError:
+        pass
+
+# Optional import for fast capture
+try:
+    import mss
+
+    MSS_AVAILABLE = True
+except ImportError:
+    MSS_AVAILABLE = False
+    print("Warning: mss not installed. Falling back to PIL ImageGrab (slower).")
+
+# mss handles are not safe to share between threads - one per thread
+_local = threading.local()
+
+
+def _get_mss():
+    """Get (or lazily create) this thread's mss instance."""
+    sct = getattr(_local, "sct", None)
+    if sct is None:
+        sct = mss.mss()
+        _local.sct = sct
+    return sct
+
+
+# One Desktop Duplication camera for the primary output, created on first use
+_dxcam = None
+_dxcam_lock = threading.Lock()
+_dxcam_last = (None, None)  # (bbox, frame) returned while the desktop is idle
+
+
+def _get_dxcam():
+    """Get (or lazily create) the dxcam camera; None if it can't be created."""
+    global _dxcam
+    with _dxcam_lock:
+        if _dxcam is None:
+            try:
+                _dxcam = dxcam.create(output_color="RGB")
+            except Exception as e:
+                print(f"dxcam unavailable, using mss: {e}")
+                _dxcam = False
+    return _dxcam or None
+
+
+def _grab_dxcam(bbox):
+    """
+    Capture bbox with dxcam, or return None if it lies off the primary
+    output (dxcam only duplicates one output; mss handles the rest).
+    """
+    global _dxcam_last
+    cam = _get_dxcam() if bbox is not None else None
+    if cam is None:
+        return None
+
+    x, y, x2, y2 = bbox
+    if x < 0 or y < 0 or x2 > cam.width or y2 > cam.height:
+        return None
+
+    frame = cam.grab(region=(x, y, x2, y2))
+    if frame is None:
+        # No new desktop frame since the last grab - reuse the previous one
+        last_bbox, last_frame = _dxcam_last
+        if last_bbox == bbox:
+            return last_frame
+        return None
+    _dxcam_last = (bbox, frame)
+    return frame
+
+
+def grab(bbox=None):
+    """
+    Capture bbox (x, y, x2, y2) in virtual desktop coordinates.
+    If bbox is None, all screens are captured.
+    """
+    if DXCAM_AVAILABLE:
+        frame = _grab_dxcam(bbox)
+        if frame is not None:
+            return frame
+
+    if MSS_AVAILABLE:
+        sct = _get_mss()
+        region = bbox if bbox is not None else sct.monitors[0]
+        shot = sct.grab(region)
+        # Wrap the raw BGRA buffer directly; no PIL image in between
+        frame = np.frombuffer(shot.raw, dtype=np.uint8).reshape(
+            shot.height, shot.width, 4
+        )
+        return frame[:, :, 2::-1]  # BGRA -> RGB view, no copy
+
+    frame = np.asarray(ImageGrab.grab(bbox=bbox, all_screens=True))
+    # Some platforms (e.g. macOS) hand back RGBA - drop alpha as a view
+    return frame[:, :, :3]
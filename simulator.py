@@ -8,11 +8,14 @@ Run this FIRST, then run app.py and connect to: 127.0.0.1
 """
 
 import asyncio
+import base64
 import websockets
 import json
 import tkinter as tk
 from threading import Thread
 import struct
+import time
+import numpy as np
 
 # Configuration
 LAYOUT_MODE = "U_SHAPE"  # Options: "GRID", "U_SHAPE"
@@ -56,12 +59,20 @@ class LEDSimulator:
         self.canvas.pack(fill="both", expand=True, padx=20, pady=10)
 
         # LED state
-        self.led_colors = [(0, 0, 0)] * NUM_LEDS
+        self.led_colors = np.zeros((NUM_LEDS, 3), dtype=np.uint8)
         self.led_ovals = []
         self.calibration_mode = False
         self.highlight_led = -1
         self.brightness = 255
 
+        # Canvas items are built once per layout and recolored in place
+        self._layout_size = None
+        self._led_items = []  # (glow, oval, text or None) per LED
+        self._drawn_colors = []
+        self._drawn_source = None
+        self._drawn_state = None
+        self.canvas.bind("<Configure>", self._on_canvas_resize)
+
         # Draw initial LEDs
         self.root.after(100, self.draw_leds)
 
@@ -75,17 +86,12 @@ class LEDSimulator:
         )
         info.pack(pady=5)
 
-    def draw_leds(self):
-        self.canvas.delete("all")
-        self.led_ovals = []
-
-        w = self.canvas.winfo_width()
-        h = self.canvas.winfo_height()
-
-        if w < 10 or h < 10:
-            self.root.after(100, self.draw_leds)
-            return
+    def _on_canvas_resize(self, event):
+        # Rebuild the LED items at the new size on the next redraw
+        self._layout_size = None
 
+    def _led_locations(self, w, h):
+        """LED centers for the current layout and the LED radius."""
         led_size = 15  # Default size
 
         locations = []  # List of (x, y) tuples
@@ -135,41 +141,27 @@ class LEDSimulator:
                     y = h - m - step * (i + 1)  # Start from bottom
                     locations.append((x, y))
 
-        # Render Loop
-        for i, (x, y) in enumerate(locations):
-            # Get color
-            if self.calibration_mode and i == self.highlight_led:
-                # Blinking white during calibration
-                import time
+        return locations, led_size
 
-                if int(time.time() * 2) % 2 == 0:
-                    color = "#ffffff"
-                else:
-                    color = "#333333"
-            else:
-                if i < len(self.led_colors):
-                    r, g, b = self.led_colors[i]
-                else:
-                    r, g, b = 0, 0, 0
-
-                # Apply brightness
-                r = int(r * self.brightness / 255)
-                g = int(g * self.brightness / 255)
-                b = int(b * self.brightness / 255)
-                color = f"#{r:02x}{g:02x}{b:02x}"
-
-            # Draw LED with glow effect
-            if color != "#000000":
-                # Outer glow
-                self.canvas.create_oval(
-                    x - led_size * 1.5,
-                    y - led_size * 1.5,
-                    x + led_size * 1.5,
-                    y + led_size * 1.5,
-                    fill="",
-                    outline=color,
-                    width=2,
-                )
+    def _build_led_items(self, w, h):
+        """Create the glow, LED and label items for every LED (all black)."""
+        self.canvas.delete("all")
+        self.led_ovals = []
+        self._led_items = []
+
+        locations, led_size = self._led_locations(w, h)
+        for i, (x, y) in enumerate(locations):
+            # Outer glow, hidden while the LED is off
+            glow = self.canvas.create_oval(
+                x - led_size * 1.5,
+                y - led_size * 1.5,
+                x + led_size * 1.5,
+                y + led_size * 1.5,
+                fill="",
+                outline="#000000",
+                width=2,
+                state="hidden",
+            )
 
             # Main LED
             oval = self.canvas.create_oval(
@@ -177,27 +169,90 @@ class LEDSimulator:
                 y - led_size,
                 x + led_size,
                 y + led_size,
-                fill=color,
+                fill="#000000",
                 outline="#444444",
                 width=1,
             )
             self.led_ovals.append(oval)
 
             # LED number (only every 5th or corners to avoid clutter)
+            text = None
             if i % 5 == 0 or i == 0 or i == NUM_LEDS - 1:
-                self.canvas.create_text(
+                text = self.canvas.create_text(
                     x,
                     y,
                     text=str(i),
-                    fill="#888888" if color == "#000000" else "#000000",
+                    fill="#888888",
                     font=("Arial", 8),
                 )
 
+            self._led_items.append((glow, oval, text))
+
+        self._drawn_colors = ["#000000"] * len(self._led_items)
+        self._drawn_source = None
+        self._layout_size = (w, h)
+
+    def draw_leds(self):
+        w = self.canvas.winfo_width()
+        h = self.canvas.winfo_height()
+
+        if w < 10 or h < 10:
+            self.root.after(100, self.draw_leds)
+            return
+
+        if self._layout_size != (w, h):
+            self._build_led_items(w, h)
+
+        # Blinking white during calibration
+        blink_on = self.calibration_mode and int(time.time() * 2) % 2 == 0
+
+        # Nothing to do unless the colors, brightness or highlight changed
+        # (every update assigns a new colors object, so identity is enough)
+        led_colors = self.led_colors
+        state = (self.brightness, self.calibration_mode, self.highlight_led, blink_on)
+        if led_colors is self._drawn_source and state == self._drawn_state:
+            self.root.after(100, self.draw_leds)
+            return
+        self._drawn_source = led_colors
+        self._drawn_state = state
+
+        # Apply brightness to the whole frame; LEDs without data stay black
+        scaled = np.zeros((len(self._led_items), 3), dtype=np.int32)
+        count = min(len(led_colors), len(scaled))
+        scaled[:count] = led_colors[:count]
+        # Hex-encode the whole frame at once: LED i is hex_frame[6 * i : 6 * i + 6]
+        hex_frame = (scaled * self.brightness // 255).astype(np.uint8).tobytes().hex()
+
+        # Render Loop
+        for i, (glow, oval, text) in enumerate(self._led_items):
+            # Get color
+            if self.calibration_mode and i == self.highlight_led:
+                color = "#ffffff" if blink_on else "#333333"
+            else:
+                color = "#" + hex_frame[6 * i : 6 * i + 6]
+
+            if color == self._drawn_colors[i]:
+                continue
+            self._drawn_colors[i] = color
+
+            # Glow effect only while the LED is lit
+            if color != "#000000":
+                self.canvas.itemconfig(glow, outline=color, state="normal")
+            else:
+                self.canvas.itemconfig(glow, state="hidden")
+
+            self.canvas.itemconfig(oval, fill=color)
+
+            if text is not None:
+                self.canvas.itemconfig(
+                    text, fill="#888888" if color == "#000000" else "#000000"
+                )
+
         # Redraw periodically (for calibration blink)
         self.root.after(100, self.draw_leds)
 
     def set_led_colors(self, colors):
-        """Update LED colors from binary data"""
+        """Update LED colors from an (N, 3) uint8 array"""
         self.led_colors = colors[:NUM_LEDS]
 
     def set_calibration(self, mode, led=-1):
@@ -219,13 +274,12 @@ class LEDSimulator:
 
     def test_pattern(self):
         """Run a test pattern"""
-        import time
-
         for i in range(NUM_LEDS):
-            self.led_colors = [(0, 0, 0)] * NUM_LEDS
-            self.led_colors[i] = (255, 0, 0)
+            colors = np.zeros((NUM_LEDS, 3), dtype=np.uint8)
+            colors[i] = (255, 0, 0)
+            self.led_colors = colors
             time.sleep(0.03)
-        self.led_colors = [(0, 0, 0)] * NUM_LEDS
+        self.led_colors = np.zeros((NUM_LEDS, 3), dtype=np.uint8)
 
     def run(self):
         self.root.mainloop()
@@ -241,7 +295,12 @@ async def handle_client(websocket):
     simulator.set_connected(True)
 
     # Send initial info (like real ESP32)
-    info = {"type": "info", "ledCount": NUM_LEDS}
+    info = {
+        "type": "info",
+        "ledCount": NUM_LEDS,
+        "packedMap": True,
+        "mapEnd": True,
+    }
     await websocket.send(json.dumps(info))
 
     try:
@@ -276,6 +335,26 @@ async def handle_client(websocket):
                             print(f"  ... and {len(mapping) - 5} more")
                         await websocket.send('{"type":"ack","cmd":"save_map"}')
 
+                    elif cmd == "save_map_packed":
+                        # Base64 of x,y byte pairs per LED
+                        try:
+                            packed = base64.b64decode(data.get("data", ""))
+                        except ValueError:
+                            print("Invalid packed mapping")
+                            continue
+                        pairs = list(zip(packed[0::2], packed[1::2]))
+                        print(f"Received packed mapping for {len(pairs)} LEDs")
+                        for i, (x, y) in enumerate(pairs[:5]):
+                            print(f"  LED {i}: x={x}, y={y}")
+                        if len(pairs) > 5:
+                            print(f"  ... and {len(pairs) - 5} more")
+                        await websocket.send('{"type":"ack","cmd":"save_map"}')
+                        if data.get("end"):
+                            simulator.set_calibration(False)
+                            await websocket.send(
+                                '{"type":"ack","cmd":"calibrate_end"}'
+                            )
+
                     elif cmd == "test_pattern":
                         print("Running test pattern")
                         await websocket.send('{"type":"ack","cmd":"test_pattern"}')
@@ -288,7 +367,9 @@ async def handle_client(websocket):
                         print(f"Brightness set to {value}")
 
                     elif cmd == "clear":
-                        simulator.led_colors = [(0, 0, 0)] * NUM_LEDS
+                        simulator.set_led_colors(
+                            np.zeros((NUM_LEDS, 3), dtype=np.uint8)
+                        )
                         print("LEDs cleared")
 
                 except json.JSONDecodeError:
@@ -297,12 +378,10 @@ async def handle_client(websocket):
             # Handle binary (LED color data)
             else:
                 if len(message) >= NUM_LEDS * 3:
-                    colors = []
-                    for i in range(NUM_LEDS):
-                        r = message[i * 3]
-                        g = message[i * 3 + 1]
-                        b = message[i * 3 + 2]
-                        colors.append((r, g, b))
+                    # Read-only (NUM_LEDS, 3) view over the message bytes, no copy
+                    colors = np.frombuffer(
+                        message, dtype=np.uint8, count=NUM_LEDS * 3
+                    ).reshape(NUM_LEDS, 3)
                     simulator.set_led_colors(colors)
 
                     # Log received colors periodically
@@ -313,7 +392,7 @@ async def handle_client(websocket):
                     if handle_client.frame_count % 30 == 0:
                         sample = [
                             f"LED{i}:({c[0]},{c[1]},{c[2]})"
-                            for i, c in enumerate(colors[:5])
+                            for i, c in enumerate(colors[:5].tolist())
                         ]
                         print(
                             f"[Simulator Frame {handle_client.frame_count}] Received: {', '.join(sample)}..."